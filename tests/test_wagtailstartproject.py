@@ -0,0 +1,89 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+
+from wagtailstartproject.wagtailstartproject import check_project_name, create_project, create_projects_fast
+
+
+class CheckProjectNameTest(unittest.TestCase):
+
+    def assert_error(self, project_name, message):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), self.assertRaises(SystemExit):
+            check_project_name(ArgumentParser(), project_name)
+        self.assertIn(message, stderr.getvalue())
+
+    def test_valid(self):
+        check_project_name(ArgumentParser(), 'kwikstaart')
+
+    def test_identifier(self):
+        self.assert_error('kwik-staart', "'kwik-staart' is not a valid Python identifier.")
+        self.assert_error('1kwikstaart', "'1kwikstaart' is not a valid Python identifier.")
+
+    def test_keyword(self):
+        self.assert_error('class', "'class' can not be a reserved Python keyword.")
+
+    def test_existing_module(self):
+        """Existing modules are found without importing them"""
+
+        self.assertNotIn('this', sys.modules)
+        self.assert_error('this', "'this' conflicts with the name of an existing Python module")
+        self.assertNotIn('this', sys.modules)
+
+
+class CreateProjectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.target_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target_dir)
+
+    def create_project(self, name, fast):
+        path = os.path.join(self.target_dir, name)
+        os.mkdir(path)
+        with redirect_stdout(io.StringIO()):
+            if fast:
+                create_projects_fast(['kwikstaart'], [path], jobs=4)
+            else:
+                create_project('kwikstaart', path)
+        return path
+
+    def get_files(self, path):
+        """Return the relative path, mode and contents of every file in the directory"""
+
+        files = {}
+        for root, __, filenames in os.walk(path):
+            for filename in filenames:
+                file_path = os.path.join(root, filename)
+                with open(file_path, 'rb') as f:
+                    files[os.path.relpath(file_path, path)] = (os.stat(file_path).st_mode, f.read())
+        return files
+
+    def test_fast(self):
+        """--fast creates the same files as django-admin startproject"""
+
+        startproject_files = self.get_files(self.create_project('startproject', fast=False))
+        fast_files = self.get_files(self.create_project('fast', fast=True))
+        self.assertIn(os.path.join('kwikstaart', 'settings.py'), fast_files)
+        self.assertEqual(sorted(startproject_files), sorted(fast_files))
+        for path, (mode, contents) in startproject_files.items():
+            self.assertEqual((mode, contents), fast_files[path], path)
+
+    def test_existing_files(self):
+        """Existing files are never overwritten"""
+
+        path = os.path.join(self.target_dir, 'kwikstaart')
+        os.mkdir(path)
+        with open(os.path.join(path, 'manage.py'), 'w') as f:
+            f.write('existing')
+
+        with redirect_stdout(io.StringIO()), self.assertRaises(SystemExit) as cm:
+            create_projects_fast(['kwikstaart'], [path], jobs=4)
+        self.assertIn("manage.py already exists", str(cm.exception))
+        with open(os.path.join(path, 'manage.py')) as f:
+            self.assertEqual('existing', f.read())
@@ -0,0 +1,22 @@
+"""Sample gunicorn configuration
+
+Run with:
+
+    gunicorn -c gunicorn.conf.py {{ project_name }}.wsgi
+
+Enable warmup (and warmup_gc_freeze) in local.ini to do the work of the first
+request once in the master process, before the workers are forked.
+
+"""
+import multiprocessing
+
+bind = '127.0.0.1:8000'
+
+# Load the application (and warm it up) before forking the workers
+preload_app = True
+
+workers = multiprocessing.cpu_count() * 2 + 1
+
+# Restart workers after a while, to limit memory growth
+max_requests = 1000
+max_requests_jitter = 100
@@ -0,0 +1,169 @@
+"""
+ASGI config for {{ project_name }} project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with an ASGI server, e.g. ``uvicorn {{ project_name }}.asgi:application``.
+
+Django {{ django_version }} can't run views asynchronously, so the application
+runs the WSGI application in thread pools. Searches run in a separate, bounded
+pool (ASGI_SEARCH_THREADS), so slow searches can't take up the threads that
+serve pages (ASGI_THREADS).
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+import os
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "{{ project_name }}.settings")
+
+
+class ThreadPoolHandler(object):
+    """Serve a WSGI application to ASGI (3.0) servers, using thread pools
+
+    Requests are handled by the first pool with a path prefix matching the
+    request path, or by the default pool. Responses are sent when the WSGI
+    application has finished, streaming responses (e.g. document downloads)
+    are sent chunk by chunk as the pool produces them.
+
+    """
+
+    def __init__(self, wsgi_application, max_workers, prefix_pools=None):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.prefix_executors = [
+            (prefix, ThreadPoolExecutor(workers)) for prefix, workers in (prefix_pools or [])
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError('Unsupported scope type: {type}'.format(type=scope['type']))
+
+        body = await self.read_body(receive)
+        environ = self.get_environ(scope, body)
+        loop = asyncio.get_event_loop()
+        executor = self.get_executor(scope['path'])
+        status, headers, content, result = await loop.run_in_executor(
+            executor, self.run_wsgi_application, environ
+        )
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        if result is None:
+            await send({'type': 'http.response.body', 'body': content})
+            return
+
+        try:
+            chunks = iter(result)
+            while True:
+                chunk = await loop.run_in_executor(executor, next, chunks, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                await loop.run_in_executor(executor, result.close)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for executor in [self.executor] + [executor for __, executor in self.prefix_executors]:
+                    executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def read_body(receive):
+        body = b''
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                break
+        return body
+
+    def get_executor(self, path):
+        for prefix, executor in self.prefix_executors:
+            if path.startswith(prefix):
+                return executor
+        return self.executor
+
+    @staticmethod
+    def get_environ(scope, body):
+        server_name, server_port = scope.get('server') or ('localhost', 80)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            # WSGI expects the (utf-8 encoded) path as a latin-1 string
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server_name,
+            'SERVER_PORT': str(server_port),
+            'SERVER_PROTOCOL': 'HTTP/{version}'.format(version=scope.get('http_version', '1.1')),
+            'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = 'HTTP_' + name
+            value = value.decode('latin-1')
+            if name in environ:
+                # Repeated headers are combined, cookies with their own separator
+                separator = '; ' if name == 'HTTP_COOKIE' else ','
+                value = environ[name] + separator + value
+            environ[name] = value
+        return environ
+
+    def run_wsgi_application(self, environ):
+        """Return the status, headers and content of the response
+
+        The content of streaming responses isn't read, the WSGI result is
+        returned instead to iterate over it chunk by chunk.
+
+        """
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers
+            ]
+
+        result = self.wsgi_application(environ, start_response)
+        if getattr(result, 'streaming', False):
+            return response['status'], response['headers'], None, result
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return response['status'], response['headers'], content, None
+
+
+application = ThreadPoolHandler(
+    get_wsgi_application(),
+    max_workers=settings.ASGI_THREADS,
+    prefix_pools=[('/search/', settings.ASGI_SEARCH_THREADS)],
+)
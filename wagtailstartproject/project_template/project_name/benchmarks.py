@@ -0,0 +1,8 @@
+from __future__ import absolute_import, unicode_literals
+
+
+def percentile(values, percent):
+    """Return the value below which the given percentage of the values falls"""
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
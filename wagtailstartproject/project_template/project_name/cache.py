@@ -0,0 +1,254 @@
+from __future__ import absolute_import, unicode_literals
+
+import pickle
+import threading
+import time
+import uuid
+
+from collections import Counter, OrderedDict
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+def get_generation(name):
+    """Return the current generation of a group of cached data
+
+    Include the generation in cache keys to invalidate a whole group of keys
+    at once by bumping the generation. A generation that got evicted from the
+    cache restarts at the current time, so it never reuses an older value.
+
+    Returns None if the cache doesn't keep values (e.g. DummyCache), data
+    kept in memory per generation should then not be kept at all.
+
+    """
+    key = 'generation:' + name
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(name):
+    """Invalidate all cache keys built with the current generation
+
+    Relies on an atomic incr() of the shared cache (memcached, redis). With
+    the default FileBasedCache concurrent bumps may count as one, which still
+    invalidates the keys.
+
+    """
+
+    try:
+        cache.incr('generation:' + name)
+    except ValueError:
+        # Not in the cache (anymore), start a new generation
+        get_generation(name)
+
+
+_local_caches = {}
+_local_locks = {}
+_local_stats = {}
+_key_locks = [threading.Lock() for __ in range(64)]
+_missing = object()
+
+
+class TieredCache(BaseCache):
+    """A small per-process LRU cache in front of a shared cache
+
+    LOCATION is the alias of the shared cache. Supported OPTIONS:
+
+    - MAX_ENTRIES: the number of entries kept in the process (default: 300)
+    - LOCAL_TIMEOUT: how long entries are kept in the process (in seconds,
+      default: 5). This is how long other processes can still see a value
+      after it is changed or deleted.
+    - LOCK_TIMEOUT: how long get_or_set() waits for another process that is
+      computing the same value (in seconds, default: 10).
+
+    Hits and misses are counted per process, see `stats`.
+
+    The lock of get_or_set() relies on an atomic add() of the shared cache
+    (memcached, redis). With FileBasedCache add() isn't atomic, so the lock is
+    best-effort and a value may occasionally be computed more than once.
+
+    """
+
+    def __init__(self, location, params):
+        super(TieredCache, self).__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = location
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self.lock_timeout = options.get('LOCK_TIMEOUT', 10)
+
+        # Django creates cache instances per thread, so share the local cache
+        # and counters between the instances of the process
+        self._local = _local_caches.setdefault(location, OrderedDict())
+        self._lock = _local_locks.setdefault(location, threading.RLock())
+        self.stats = _local_stats.setdefault(location, Counter())
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _get_local(self, key):
+        with self._lock:
+            try:
+                expires, pickled = self._local[key]
+            except KeyError:
+                return _missing
+            if expires < time.time():
+                del self._local[key]
+                return _missing
+            self._local.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def _set_local(self, key, value, timeout):
+        timeout = self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+        if timeout <= 0:
+            self._delete_local(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (time.time() + timeout, pickled)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    def _delete_local(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _get_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return timeout
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_key(key, version)
+        value = self._get_local(local_key)
+        if value is not _missing:
+            self.stats['local_hits'] += 1
+            return value
+
+        value = self.shared.get(key, _missing, version=version)
+        if value is _missing:
+            self.stats['misses'] += 1
+            return default
+
+        self.stats['shared_hits'] += 1
+        self._set_local(local_key, value, None)
+        return value
+
+    def get_many(self, keys, version=None):
+        result = {}
+        for key in keys:
+            value = self._get_local(self.make_key(key, version))
+            if value is not _missing:
+                result[key] = value
+        self.stats['local_hits'] += len(result)
+
+        missing = [key for key in keys if key not in result]
+        if missing:
+            found = self.shared.get_many(missing, version=version)
+            self.stats['shared_hits'] += len(found)
+            self.stats['misses'] += len(missing) - len(found)
+            for key, value in found.items():
+                self._set_local(self.make_key(key, version), value, None)
+            result.update(found)
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._get_timeout(timeout)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._set_local(self.make_key(key, version), value, timeout)
+        return added
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._get_timeout(timeout)
+        self.shared.set(key, value, timeout, version=version)
+        self._set_local(self.make_key(key, version), value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._get_timeout(timeout)
+        failed_keys = self.shared.set_many(data, timeout, version=version) or []
+        for key, value in data.items():
+            if key not in failed_keys:
+                self._set_local(self.make_key(key, version), value, timeout)
+        return failed_keys
+
+    def delete(self, key, version=None):
+        self._delete_local(self.make_key(key, version))
+        self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._delete_local(self.make_key(key, version))
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _missing, version=version) is not _missing
+
+    def incr(self, key, delta=1, version=None):
+        self._delete_local(self.make_key(key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._delete_local(self.make_key(key, version))
+        return self.shared.decr(key, delta, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        """Get the value or compute it, only once when requested concurrently
+
+        Threads of this process wait for the thread computing the value, other
+        processes wait until the value shows up in the shared cache (or until
+        LOCK_TIMEOUT, after which they compute it themselves).
+
+        """
+        value = self.get(key, _missing, version=version)
+        if value is not _missing:
+            return value
+
+        local_key = self.make_key(key, version)
+        with _key_locks[hash(local_key) % len(_key_locks)]:
+            value = self.get(key, _missing, version=version)
+            if value is not _missing:
+                return value
+
+            lock_key = 'lock:' + key
+            token = uuid.uuid4().hex
+            locked = self.shared.add(lock_key, token, self.lock_timeout, version=version)
+            if not locked:
+                self.stats['waits'] += 1
+                value = self._wait_for_shared(key, version)
+                if value is not _missing:
+                    self._set_local(local_key, value, None)
+                    return value
+
+            try:
+                self.stats['computes'] += 1
+                value = default() if callable(default) else default
+                if value is not None:
+                    self.set(key, value, timeout, version=version)
+            finally:
+                # Only release the lock of this process, not one another process holds after a timeout
+                if locked and self.shared.get(lock_key, version=version) == token:
+                    self.shared.delete(lock_key, version=version)
+        return value
+
+    def _wait_for_shared(self, key, version):
+        deadline = time.time() + self.lock_timeout
+        while time.time() < deadline:
+            time.sleep(0.05)
+            value = self.shared.get(key, _missing, version=version)
+            if value is not _missing:
+                return value
+        return _missing
@@ -0,0 +1,20 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.conf import settings
+
+
+def fragment_cache(request):
+    """Timeout for the fragment cache tags in templates
+
+    Page previews are never cached, their content may differ from the saved revision.
+
+    """
+    if getattr(request, 'is_preview', False):
+        return {'fragment_cache_timeout': 0}
+    return {'fragment_cache_timeout': settings.FRAGMENT_CACHE_TIMEOUT}
+
+
+def site(request):
+    """The site of the request, as found by the site middleware"""
+
+    return {'site': getattr(request, 'site', None)}
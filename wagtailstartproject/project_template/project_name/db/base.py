@@ -0,0 +1,133 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+import threading
+import time
+
+from psycopg2 import extensions
+
+from django.db.backends.postgresql import base
+
+
+class ConnectionPool(object):
+    """Idle database connections of the current process (with their creation time), shared by its threads"""
+
+    def __init__(self, size):
+        self.size = size
+        self.connections = []
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+
+    def get(self):
+        with self.lock:
+            if self.connections:
+                return self.connections.pop()
+
+    def put(self, connection, created_at):
+        """Keep the connection, return False if the pool is full"""
+
+        with self.lock:
+            if len(self.connections) < self.size:
+                self.connections.append((connection, created_at))
+                return True
+        return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend with optional connection pooling and health checks
+
+    Supports these extra DATABASES settings:
+
+    - POOL_SIZE: the number of idle connections to keep per process, shared by
+      the threads of a multi-threaded worker. Closed connections are returned
+      to the pool instead of being disconnected. 0 disables pooling.
+      A CONN_MAX_AGE above 0 limits how long (in seconds since they were
+      opened) pooled connections are reused, 0 or None doesn't limit it.
+    - CONN_HEALTH_CHECKS: check if a persistent or pooled connection still
+      works before reusing it, at the cost of a `SELECT 1` per request.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(DatabaseWrapper, self).__init__(*args, **kwargs)
+        self.health_check_pending = False
+        self.connection_created_at = None
+
+    @property
+    def pool(self):
+        size = self.settings_dict.get('POOL_SIZE', 0)
+        if not size:
+            return None
+
+        # Forked processes can't share connections, every process gets its own pool
+        pid = os.getpid()
+        pool = _pools.get(self.alias)
+        if pool is None or pool.pid != pid:
+            with _pools_lock:
+                pool = _pools.get(self.alias)
+                if pool is None or pool.pid != pid:
+                    pool = _pools[self.alias] = ConnectionPool(size)
+        return pool
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        while pool is not None:
+            pooled = pool.get()
+            if pooled is None:
+                break
+            connection, created_at = pooled
+            if self.is_expired(created_at):
+                connection.close()
+                continue
+            if self.settings_dict.get('CONN_HEALTH_CHECKS') and not self.is_connection_usable(connection):
+                connection.close()
+                continue
+            self.isolation_level = connection.isolation_level
+            self.connection_created_at = created_at
+            return connection
+        self.connection_created_at = time.time()
+        return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+    def _close(self):
+        pool = self.pool
+        if pool is not None and not self.in_atomic_block and self.is_connection_idle(self.connection):
+            if not self.is_expired(self.connection_created_at) and pool.put(self.connection, self.connection_created_at):
+                return
+        super(DatabaseWrapper, self)._close()
+
+    def is_expired(self, created_at):
+        max_age = self.settings_dict.get('CONN_MAX_AGE')
+        if not max_age or created_at is None:
+            return False
+        return time.time() - created_at >= max_age
+
+    def close_if_unusable_or_obsolete(self):
+        """Called at the start and end of every request"""
+
+        super(DatabaseWrapper, self).close_if_unusable_or_obsolete()
+        self.health_check_pending = self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+
+    def ensure_connection(self):
+        # Check a persistent connection once, before its first use in a request
+        if self.health_check_pending:
+            self.health_check_pending = False
+            if self.connection is not None and not self.in_atomic_block and not self.is_usable():
+                self.close()
+        super(DatabaseWrapper, self).ensure_connection()
+
+    @staticmethod
+    def is_connection_idle(connection):
+        return not connection.closed and connection.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+
+    @staticmethod
+    def is_connection_usable(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except base.Database.Error:
+            return False
+        return True
@@ -0,0 +1,176 @@
+import json
+import os
+
+from collections import OrderedDict, deque
+from itertools import cycle, islice
+from time import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from wagtail.wagtailcore.models import Site
+
+from ...benchmarks import percentile
+from ...pages.models import ContentPage
+
+
+class FakeException(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark the home page, content pages and search, and compare with a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=100, help='number of content pages to create (default: 100)')
+        parser.add_argument(
+            '--children',
+            type=int,
+            default=10,
+            help='number of child pages per page in the page tree (default: 10)'
+        )
+        parser.add_argument('--requests', type=int, default=100, help='number of requests per endpoint (default: 100)')
+        parser.add_argument('--warmup', type=int, default=5, help='number of uncounted requests per endpoint (default: 5)')
+        parser.add_argument('--query', default='benchmark', help='search query (default: "benchmark")')
+        parser.add_argument('--host', default='localhost', help='host name to request (default: localhost)')
+        parser.add_argument(
+            '--baseline',
+            default=os.path.join(settings.BASE_DIR, 'tests', 'benchmark_baseline.json'),
+            help='baseline to compare the results with (default: tests/benchmark_baseline.json)'
+        )
+        parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=25,
+            help='percentage latencies may exceed the baseline before failing (default: 25)'
+        )
+
+    def handle(self, *args, **options):
+        """Benchmark with a generated page tree without affecting the database
+
+        The caches are replaced by a local memory cache, so no responses of
+        the generated pages are left behind.
+
+        """
+        caches = {
+            'default': dict(settings.CACHES['default'], LOCATION='benchmark'),
+            'benchmark': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        }
+        try:
+            with override_settings(CACHES=caches, SEARCH_HITS_FLUSH_INTERVAL=0), transaction.atomic():
+                results = self.run_benchmark(options)
+                raise FakeException('Trigger rollback')
+        except FakeException:
+            pass
+
+        self.report(results)
+
+        if options['save_baseline']:
+            with open(options['baseline'], 'w') as baseline_file:
+                json.dump(results, baseline_file, indent=2)
+            self.stdout.write('Saved the baseline to {path}'.format(path=options['baseline']))
+        elif os.path.exists(options['baseline']):
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+            self.compare(results, baseline, options['tolerance'])
+
+    def run_benchmark(self, options):
+        site = Site.objects.get(is_default_site=True)
+        pages = self.create_pages(site.root_page, options['pages'], options['children'])
+
+        endpoints = [
+            ('home', ['/']),
+            ('page', [page.relative_url(site) for page in pages] or ['/']),
+            ('search', ['/search/?query={query}'.format(query=options['query'])]),
+        ]
+
+        client = Client(HTTP_HOST=options['host'])
+        return OrderedDict(
+            (name, self.run_endpoint(client, urls, options['requests'], options['warmup']))
+            for name, urls in endpoints
+        )
+
+    def create_pages(self, root_page, count, children):
+        """Create a tree of content pages, every page has the given number of children"""
+
+        pages = []
+        parents = deque([root_page])
+        while len(pages) < count:
+            parent = parents.popleft()
+            for __ in range(min(children, count - len(pages))):
+                number = len(pages) + 1
+                page = parent.add_child(instance=ContentPage(
+                    title='Benchmark page {number}'.format(number=number),
+                    slug='benchmark-page-{number}'.format(number=number),
+                ))
+                pages.append(page)
+                parents.append(page)
+        return pages
+
+    def run_endpoint(self, client, urls, count, warmup):
+        """Request the urls in turn, return the throughput, latencies (in ms) and query counts"""
+
+        for url in islice(cycle(urls), warmup):
+            client.get(url)
+
+        durations = []
+        queries = []
+        start = time()
+        for url in islice(cycle(urls), count):
+            with CaptureQueriesContext(connection) as context:
+                request_start = time()
+                response = client.get(url)
+                durations.append((time() - request_start) * 1000)
+            if response.status_code != 200:
+                raise CommandError('{url} returned status code {status_code}'.format(
+                    url=url, status_code=response.status_code
+                ))
+            queries.append(len(context))
+        total_time = time() - start
+
+        return OrderedDict([
+            ('requests', count),
+            ('rps', count / total_time),
+            ('p50', percentile(durations, 50)),
+            ('p95', percentile(durations, 95)),
+            ('p99', percentile(durations, 99)),
+            ('queries', max(queries)),
+            ('queries_mean', sum(queries) / float(len(queries))),
+        ])
+
+    def report(self, results):
+        self.stdout.write('{:<8} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8}'.format(
+            'endpoint', 'requests', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'queries'
+        ))
+        for name, result in results.items():
+            self.stdout.write('{:<8} {requests:>8} {rps:>8.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {queries:>8}'.format(
+                name, **result
+            ))
+
+    def compare(self, results, baseline, tolerance):
+        """Fail when latencies exceed the baseline by more than the tolerance, or more queries are done"""
+
+        regressions = []
+        for name, result in results.items():
+            expected = baseline.get(name)
+            if not expected:
+                continue
+            for key in ['p50', 'p95', 'p99']:
+                if result[key] > expected[key] * (1 + tolerance / 100):
+                    regressions.append('{name} {key}: {value:.1f} ms, baseline {expected:.1f} ms'.format(
+                        name=name, key=key, value=result[key], expected=expected[key]
+                    ))
+            if result['queries'] > expected['queries']:
+                regressions.append('{name} queries: {value}, baseline {expected}'.format(
+                    name=name, value=result['queries'], expected=expected['queries']
+                ))
+
+        if regressions:
+            raise CommandError('Performance regressed compared to the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write('No regressions compared to the baseline (tolerance {tolerance:g}%)'.format(
+            tolerance=tolerance
+        ))
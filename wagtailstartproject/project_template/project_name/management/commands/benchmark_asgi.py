@@ -0,0 +1,135 @@
+import asyncio
+import threading
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from time import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from ...asgi import ThreadPoolHandler
+from ...benchmarks import percentile
+
+
+class Command(BaseCommand):
+    help = "Compare the WSGI and ASGI applications under concurrent search load"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='number of requests per run (default: 200)')
+        parser.add_argument('--concurrency', type=int, default=20, help='number of concurrent clients (default: 20)')
+        parser.add_argument(
+            '--wsgi-workers',
+            type=int,
+            default=4,
+            help='number of WSGI workers to simulate, e.g. gunicorn sync workers (default: 4)'
+        )
+        parser.add_argument('--query', default='home', help='search query (default: "home")')
+        parser.add_argument('--host', default='localhost', help='host name to request (default: localhost)')
+
+    def handle(self, *args, **options):
+        wsgi_application = get_wsgi_application()
+        asgi_application = ThreadPoolHandler(
+            wsgi_application,
+            max_workers=settings.ASGI_THREADS,
+            prefix_pools=[('/search/', settings.ASGI_SEARCH_THREADS)],
+        )
+
+        # Half of the requests are searches, the other half page requests
+        requests = [
+            ('search', self.get_scope(options['host'], '/search/', 'query=' + options['query'])),
+            ('page', self.get_scope(options['host'], '/', '')),
+        ]
+        requests = [request for request, __ in zip(cycle(requests), range(options['requests']))]
+
+        self.stdout.write('{:<6} {:<8} {:>8} {:>8} {:>8} {:>8}'.format(
+            'mode', 'endpoint', 'requests', 'req/s', 'p50 ms', 'p95 ms'
+        ))
+        self.report('wsgi', *self.run_wsgi(wsgi_application, requests, options))
+        self.report('asgi', *self.run_asgi(asgi_application, requests, options))
+
+    @staticmethod
+    def get_scope(host, path, query_string):
+        return {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': query_string.encode('ascii'),
+            'headers': [(b'host', host.encode('ascii'))],
+            'server': (host, 80),
+        }
+
+    def run_wsgi(self, application, requests, options):
+        """Clients send requests to a fixed number of synchronous workers"""
+
+        durations = defaultdict(list)
+        pending = iter(requests)
+        lock = threading.Lock()
+
+        def call(environ):
+            status = []
+
+            def start_response(status_line, headers, exc_info=None):
+                status.append(status_line)
+
+            result = application(environ, start_response)
+            try:
+                b''.join(result)
+            finally:
+                result.close()
+
+        def client(workers):
+            while True:
+                with lock:
+                    request = next(pending, None)
+                if request is None:
+                    return
+                name, scope = request
+                start = time()
+                workers.submit(call, ThreadPoolHandler.get_environ(scope, b'')).result()
+                durations[name].append(time() - start)
+
+        start = time()
+        with ThreadPoolExecutor(options['wsgi_workers']) as workers:
+            clients = [threading.Thread(target=client, args=(workers,)) for __ in range(options['concurrency'])]
+            for thread in clients:
+                thread.start()
+            for thread in clients:
+                thread.join()
+        return durations, time() - start
+
+    def run_asgi(self, application, requests, options):
+        """Clients send requests to the ASGI application"""
+
+        durations = defaultdict(list)
+        pending = iter(requests)
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            pass
+
+        async def client():
+            for name, scope in pending:
+                start = time()
+                await application(scope, receive, send)
+                durations[name].append(time() - start)
+
+        start = time()
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(asyncio.gather(*[client() for __ in range(options['concurrency'])]))
+        return durations, time() - start
+
+    def report(self, mode, durations, total_time):
+        for name, values in sorted(durations.items()):
+            self.stdout.write('{:<6} {:<8} {:>8} {:>8.1f} {:>8.1f} {:>8.1f}'.format(
+                mode,
+                name,
+                len(values),
+                len(values) / total_time,
+                percentile(values, 50) * 1000,
+                percentile(values, 95) * 1000,
+            ))
@@ -0,0 +1,150 @@
+import multiprocessing
+import os
+
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import connections
+from django.template.base import TOKEN_BLOCK, Lexer
+
+from wagtail.wagtailimages import get_image_model
+from wagtail.wagtailimages.exceptions import InvalidFilterSpecError
+from wagtail.wagtailimages.models import Filter, SourceImageIOError
+
+
+def get_template_dirs():
+    """Return the template directories of the project, not those of third party apps"""
+
+    template_dirs = []
+    for engine in settings.TEMPLATES:
+        template_dirs.extend(engine.get('DIRS', []))
+    for app_config in apps.get_app_configs():
+        if app_config.path.startswith(settings.BASE_DIR):
+            template_dirs.append(os.path.join(app_config.path, 'templates'))
+    return template_dirs
+
+
+def get_filter_specs(template_string):
+    """Return the filter specs of the image tags in the template, e.g. 'fill-80x80' for page.photo fill-80x80"""
+
+    filter_specs = set()
+    for token in Lexer(template_string).tokenize():
+        if token.token_type != TOKEN_BLOCK or not token.contents.startswith('image '):
+            continue
+        # Same parsing as the image tag: the bits after the image and before 'as', except attributes
+        specs = []
+        for bit in token.split_contents()[2:]:
+            if bit == 'as':
+                break
+            if '=' not in bit:
+                specs.append(bit)
+        if specs:
+            filter_specs.add('|'.join(specs))
+    return filter_specs
+
+
+def generate_renditions(task):
+    """Generate the renditions of an image, return the image id, the number of renditions and an error"""
+
+    image_id, filter_specs = task
+    try:
+        image = get_image_model().objects.get(pk=image_id)
+        for filter_spec in filter_specs:
+            image.get_rendition(filter_spec)
+    except (get_image_model().DoesNotExist, SourceImageIOError) as e:
+        return image_id, len(filter_specs), e
+    return image_id, len(filter_specs), None
+
+
+class Command(BaseCommand):
+    help = "Generate the missing image renditions for the filter specs of the templates"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--spec',
+            action='append',
+            dest='filter_specs',
+            help='filter spec to generate, instead of those of the templates and settings (can be repeated)'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help='number of processes generating renditions (default: number of processors)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='only show what would be generated')
+
+    def handle(self, *args, **options):
+        filter_specs = options['filter_specs'] or self.collect_filter_specs()
+        filter_specs = self.validate(filter_specs)
+        self.stdout.write('Filter specs: {filter_specs}'.format(filter_specs=', '.join(sorted(filter_specs))))
+
+        tasks = self.get_missing_renditions(filter_specs)
+        total = sum(len(specs) for __, specs in tasks)
+        self.stdout.write('{total} missing renditions of {count} images'.format(total=total, count=len(tasks)))
+        if options['dry_run'] or not tasks:
+            return
+
+        # Every process opens its own database connection
+        connections.close_all()
+        pool = multiprocessing.Pool(options['processes'])
+        done = 0
+        try:
+            for image_id, count, error in pool.imap_unordered(generate_renditions, tasks):
+                done += count
+                if error:
+                    self.stderr.write('\nImage {image_id}: {error}'.format(image_id=image_id, error=error))
+                self.stdout.write('\r{done}/{total} renditions'.format(done=done, total=total), ending='')
+        finally:
+            pool.terminate()
+            pool.join()
+        self.stdout.write('')
+
+    def collect_filter_specs(self):
+        """Return the filter specs used in the templates of the project and the IMAGE_RENDITION_FILTER_SPECS setting"""
+
+        filter_specs = set(getattr(settings, 'IMAGE_RENDITION_FILTER_SPECS', []))
+        for template_dir in get_template_dirs():
+            for dirpath, __, filenames in os.walk(template_dir):
+                for filename in filenames:
+                    with open(os.path.join(dirpath, filename), encoding='utf-8') as template_file:
+                        filter_specs.update(get_filter_specs(template_file.read()))
+        return filter_specs
+
+    def validate(self, filter_specs):
+        valid_filter_specs = set()
+        for filter_spec in filter_specs:
+            try:
+                Filter(spec=filter_spec).operations
+            except InvalidFilterSpecError as e:
+                self.stderr.write('Skipping invalid filter spec {filter_spec}: {error}'.format(
+                    filter_spec=filter_spec, error=e
+                ))
+            else:
+                valid_filter_specs.add(filter_spec)
+        return valid_filter_specs
+
+    def get_missing_renditions(self, filter_specs):
+        """Return (image id, filter specs) for the renditions that don't exist yet
+
+        Renditions are keyed on the filter spec and the focal point (for
+        filters that use it), like Image.get_rendition looks them up. As
+        generated renditions are stored immediately, an interrupted run
+        continues where it stopped.
+
+        """
+        image_model = get_image_model()
+        filters = [Filter(spec=filter_spec) for filter_spec in filter_specs]
+
+        existing = set(image_model.get_rendition_model().objects.filter(filter_spec__in=filter_specs).values_list(
+            'image_id', 'filter_spec', 'focal_point_key'
+        ))
+
+        missing = defaultdict(list)
+        for image in image_model.objects.order_by('pk').iterator():
+            for image_filter in filters:
+                if (image.pk, image_filter.spec, image_filter.get_cache_key(image)) not in existing:
+                    missing[image.pk].append(image_filter.spec)
+        return list(missing.items())
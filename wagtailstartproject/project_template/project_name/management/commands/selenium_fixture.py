@@ -1,22 +1,71 @@
+import bz2
+import gzip
 import os
+import shutil
+import tempfile
 
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+from django.apps import apps
 from django.conf import settings
-from django.core.management import BaseCommand, call_command
-from django.db import transaction
+from django.core import serializers
+from django.core.management import BaseCommand
+from django.core.serializers.json import Serializer as JSONSerializer
+from django.db import DEFAULT_DB_ALIAS, connection, router, transaction
+
+COMPRESSION_FORMATS = {
+    'gz': gzip.open,
+    'bz2': bz2.open,
+}
 
 
 class FakeException(Exception):
     pass
 
 
+class FragmentSerializer(JSONSerializer):
+    """JSON serializer that leaves out the enclosing brackets
+
+    The output of several serializers can be joined with commas into one list.
+
+    """
+
+    def start_serialization(self):
+        self._init_options()
+
+    def end_serialization(self):
+        pass
+
+
 class Command(BaseCommand):
     help = "Create a fixture for Selenium tests"
 
     def __init__(self, *args, **kwargs):
         super(Command, self).__init__(*args, **kwargs)
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compress',
+            choices=sorted(COMPRESSION_FORMATS),
+            help='compress the fixture, loaddata reads compressed fixtures directly'
+        )
+        parser.add_argument(
+            '--indent',
+            type=int,
+            default=2,
+            help='indentation of the JSON output, 0 for compact output (default: 2)'
+        )
+        parser.add_argument(
+            '--parallel',
+            type=int,
+            default=1,
+            help='number of models to export at the same time (requires PostgreSQL 10+)'
+        )
+
     def handle(self, *args, **options):
         """Perform data manipulation and datadump without affecting the database"""
+        self.options = options
         try:
             with transaction.atomic():
                 self.manipulate_data()
@@ -33,8 +82,8 @@ class Command(BaseCommand):
         """
         pass
 
-    def create_fixture(self):
-        """Create the fixture using the dumpdata command"""
+    def get_models(self):
+        """Return the models to dump, sorted by their (natural key) dependencies"""
 
         excluded = [
             'admin',
@@ -44,13 +93,118 @@ class Command(BaseCommand):
             'wagtailcore.grouppagepermission',
             'wagtailcore.groupcollectionpermission',
         ]
+        excluded = set(label.lower() for label in excluded)
+
+        app_list = []
+        for app_config in apps.get_app_configs():
+            if app_config.label in excluded:
+                continue
+            models = [model for model in app_config.get_models() if self.include_model(model, excluded)]
+            app_list.append((app_config, models))
+        return serializers.sort_dependencies(app_list)
+
+    def include_model(self, model, excluded):
+        if model._meta.label_lower in excluded or model._meta.proxy:
+            return False
+        return router.allow_migrate_model(DEFAULT_DB_ALIAS, model)
+
+    def create_fixture(self):
+        """Write the fixture, streaming the objects of every model"""
+
+        json_path = os.path.join(settings.BASE_DIR, 'tests/fixtures/basic_site.json')
+        compress = self.options['compress']
+        path = json_path + '.' + compress if compress else json_path
+
+        # loaddata refuses to choose between fixtures with the same name, remove the other variants
+        for stale_path in [json_path] + [json_path + '.' + extension for extension in COMPRESSION_FORMATS]:
+            if stale_path != path and os.path.exists(stale_path):
+                os.remove(stale_path)
+
+        models = self.get_models()
+        parallel = self.options['parallel'] > 1 and self.can_export_in_parallel()
+        start = time()
+
+        open_fixture = COMPRESSION_FORMATS.get(compress, open)
+        with open_fixture(path, 'wt', encoding='utf-8') as fixture:
+            fixture.write('[')
+            if parallel:
+                self.export_parallel(models, fixture)
+            else:
+                self.export_serial(models, fixture)
+            fixture.write('\n]\n')
+
+        self.stdout.write('Created {path} in {seconds:.2f}s'.format(path=path, seconds=time() - start))
+
+    def can_export_in_parallel(self):
+        """Parallel exports can't see the changes made in this transaction"""
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT txid_current_if_assigned()')
+            if cursor.fetchone()[0] is None:
+                return True
+
+        self.stderr.write('Data was changed by manipulate_data(), exporting models one at a time.')
+        return False
+
+    def export_serial(self, models, fixture):
+        first = True
+        for model in models:
+            first = self.export_model(model, fixture, first) and first
+
+    def export_parallel(self, models, fixture):
+        """Export models to temporary files in worker threads, then join them in order
+
+        The workers use their own database connection, with the snapshot of the
+        database used by this transaction.
+
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_export_snapshot()')
+            snapshot = cursor.fetchone()[0]
+
+        def export(model):
+            part = tempfile.TemporaryFile('w+', encoding='utf-8')
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+                    cursor.execute('SET TRANSACTION SNAPSHOT %s', [snapshot])
+                    empty = self.export_model(model, part, first=True)
+            finally:
+                connection.close()
+            part.seek(0)
+            return part, empty
+
+        first = True
+        with ThreadPoolExecutor(self.options['parallel']) as executor:
+            for part, empty in executor.map(export, models):
+                with part:
+                    if not empty:
+                        if not first:
+                            fixture.write(',')
+                        shutil.copyfileobj(part, fixture)
+                        first = False
+
+    def export_model(self, model, stream, first):
+        """Write the objects of the model, return True if there were none"""
+
+        start = time()
+        count = [0]
 
-        path = os.path.join(settings.BASE_DIR, 'tests/fixtures/basic_site.json')
+        def objects():
+            for obj in model._default_manager.order_by(model._meta.pk.name).iterator():
+                if not first and not count[0]:
+                    # Separate the objects from those of the previous model
+                    stream.write(',')
+                count[0] += 1
+                yield obj
 
-        call_command(
-            'dumpdata',
-            exclude=excluded,
-            natural_foreign=True,
-            indent=2,
-            output=path
+        FragmentSerializer().serialize(
+            objects(),
+            stream=stream,
+            indent=self.options['indent'] or None,
+            use_natural_foreign_keys=True,
         )
+        self.stdout.write('{model}: {count} objects in {seconds:.2f}s'.format(
+            model=model._meta.label, count=count[0], seconds=time() - start
+        ))
+        return not count[0]
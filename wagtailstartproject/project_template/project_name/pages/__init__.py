@@ -0,0 +1 @@
+default_app_config = '{{ project_name }}.pages.apps.PagesConfig'
@@ -0,0 +1,79 @@
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.cache import cc_delim_re
+
+from ..cache import get_generation
+
+
+def get_cache_key(site_id, path):
+    """Return the cache key of a page URL, holding the token and vary headers of its variants
+
+    The navigation on every page shows other pages, so all cached pages are
+    invalidated when a page is (un)published, moved or deleted.
+
+    """
+    return 'pagecache:{generation}:{site_id}:{path}'.format(
+        generation=get_generation('pages'),
+        site_id=site_id,
+        path=hashlib.md5(path.encode('utf-8')).hexdigest(),
+    )
+
+
+def get_vary_headers(response):
+    """Return the headers the response varies on, PAGE_CACHE_VARY_HEADERS and those in its Vary header"""
+
+    headers = set(header.lower() for header in getattr(settings, 'PAGE_CACHE_VARY_HEADERS', []))
+    if response.has_header('Vary'):
+        headers.update(header.strip().lower() for header in cc_delim_re.split(response['Vary']))
+    return sorted(headers)
+
+
+def get_variant_key(request, url_entry):
+    """Return the key of the variant of a page URL that matches the request
+
+    Every variant is stored under its own key, built from the token of the
+    URL entry and the scheme and vary headers of the request. When the URL
+    entry is replaced its variants are unreachable, they expire on their own.
+
+    """
+    values = [request.scheme]
+    for header in url_entry['headers']:
+        values.append(request.META.get('HTTP_' + header.upper().replace('-', '_'), ''))
+    return 'pagecache:variant:{token}:{values}'.format(
+        token=url_entry['token'],
+        values=hashlib.md5('|'.join(values).encode('utf-8')).hexdigest(),
+    )
+
+
+def get_cached_response(request):
+    url_entry = cache.get(get_cache_key(request.site.pk, request.path_info))
+    if url_entry:
+        return cache.get(get_variant_key(request, url_entry))
+
+
+def set_cached_response(request, response, timeout):
+    headers = get_vary_headers(response)
+    if '*' in headers:
+        return
+
+    key = get_cache_key(request.site.pk, request.path_info)
+    url_entry = cache.get(key)
+    if not url_entry or url_entry['headers'] != headers:
+        url_entry = {'token': uuid.uuid4().hex, 'headers': headers}
+        cache.set(key, url_entry, timeout)
+    cache.set(get_variant_key(request, url_entry), response, timeout)
+
+
+def get_page_path(root_path, url_path):
+    """Return the path of a page on the site with the given root, like Page.relative_url() without queries"""
+
+    page_path = reverse('wagtail_serve', args=(url_path[len(root_path):],))
+    if not getattr(settings, 'WAGTAIL_APPEND_SLASH', True) and page_path != '/':
+        page_path = page_path.rstrip('/')
+    return page_path
@@ -0,0 +1,74 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from wagtail.wagtailcore import views as wagtail_views
+
+from .cache import get_cached_response, set_cached_response
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    MiddlewareMixin = object
+
+
+class PageCacheMiddleware(MiddlewareMixin):
+    """Cache the responses of Wagtail pages for anonymous visitors
+
+    Only requests handled by Wagtail's serve view are cached. As every page
+    shows the navigation, all cached pages are invalidated when any page is
+    (un)published, moved or deleted (see pages.signals). The
+    PAGE_CACHE_TIMEOUT setting limits how long anything else can go stale.
+
+    Note: Place this middleware after the authentication and site middleware.
+
+    """
+
+    def __init__(self, get_response=None):
+        self.timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 0)
+        if not self.timeout:
+            raise MiddlewareNotUsed
+        super(PageCacheMiddleware, self).__init__(get_response)
+
+    def is_cacheable_request(self, request):
+        if request.method not in ('GET', 'HEAD') or request.META.get('QUERY_STRING'):
+            return False
+        if getattr(request, 'site', None) is None or getattr(request, 'is_preview', False):
+            return False
+        return not request.user.is_authenticated
+
+    def is_cacheable_response(self, request, response):
+        if response.status_code != 200 or response.streaming or response.cookies:
+            return False
+        if request.META.get('CSRF_COOKIE_USED'):
+            # The page contains the CSRF token of this visitor
+            return False
+        cache_control = response.get('Cache-Control', '').lower()
+        return not any(directive in cache_control for directive in ('private', 'no-cache', 'no-store'))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func is not wagtail_views.serve or not self.is_cacheable_request(request):
+            return None
+
+        response = get_cached_response(request)
+        if response is None:
+            # Store the response on the way out
+            request._page_cache_update = True
+            return None
+
+        # The cached page may still be in the cache of the browser or CDN
+        last_modified = response.get('Last-Modified')
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+            response=response,
+        )
+
+    def process_response(self, request, response):
+        if getattr(request, '_page_cache_update', False) and self.is_cacheable_response(request, response):
+            set_cached_response(request, response, self.timeout)
+        return response
@@ -1,11 +1,61 @@
 from __future__ import absolute_import, unicode_literals
 
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+
 from wagtail.wagtailcore.models import Page
 
+from ..cache import get_generation
+
+
+class ConditionalServeMixin(object):
+    """Serve the page with an ETag, and answer conditional requests with a 304
+
+    The 304 is returned before the page is rendered. The ETag changes when
+    the page is published, when another page is (un)published or moved (the
+    navigation shows other pages) and with the TEMPLATE_VERSION setting.
+
+    No Last-Modified header is sent: the publication date of the page doesn't
+    change with the navigation, so revalidating with If-Modified-Since would
+    confirm pages with an outdated menu.
+
+    Authenticated users and previews always get a freshly rendered page.
+
+    """
+
+    # Arguments of patch_cache_control for this page type, defaults to the PAGE_CACHE_CONTROL setting
+    cache_control = None
+
+    def get_last_modified(self):
+        return self.last_published_at or self.latest_revision_created_at
+
+    def get_etag(self, last_modified):
+        return 'W/"{pk}-{timestamp}-{generation}-{template_version}"'.format(
+            pk=self.pk,
+            timestamp=last_modified.isoformat() if last_modified else '',
+            generation=get_generation('pages'),
+            template_version=settings.TEMPLATE_VERSION,
+        )
+
+    def serve(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or getattr(request, 'is_preview', False):
+            return super(ConditionalServeMixin, self).serve(request, *args, **kwargs)
+        if request.user.is_authenticated:
+            return super(ConditionalServeMixin, self).serve(request, *args, **kwargs)
+
+        etag = self.get_etag(self.get_last_modified())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super(ConditionalServeMixin, self).serve(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        patch_cache_control(response, **(self.cache_control or settings.PAGE_CACHE_CONTROL))
+        return response
+
 
-class HomePage(Page):
+class HomePage(ConditionalServeMixin, Page):
     pass
 
 
-class ContentPage(Page):
+class ContentPage(ConditionalServeMixin, Page):
     pass
@@ -0,0 +1,60 @@
+from __future__ import absolute_import, unicode_literals
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from wagtail.wagtailcore.models import Page
+
+from ..cache import get_generation
+from .cache import get_page_path
+
+NavigationItem = namedtuple('NavigationItem', ['page_id', 'title', 'url', 'path', 'children'])
+
+
+def get_navigation_key(site, depth):
+    return 'navigation:{generation}:{site_id}:{depth}'.format(
+        generation=get_generation('pages'), site_id=site.pk, depth=depth
+    )
+
+
+def build_navigation_tree(root_page, depth):
+    """Return the items of the live pages shown in menus, up to depth levels below the root page
+
+    All pages are loaded in one query on the path prefix of the root page and
+    assembled into a tree by their paths. A page is only included if its
+    parent is, like a menu built with get_children().live().in_menu() per
+    level.
+
+    """
+    pages = Page.objects.live().in_menu().filter(
+        path__startswith=root_page.path,
+        depth__gt=root_page.depth,
+        depth__lte=root_page.depth + depth,
+    ).order_by('path').values_list('pk', 'title', 'url_path', 'path')
+
+    root = NavigationItem(
+        root_page.pk, root_page.title, get_page_path(root_page.url_path, root_page.url_path), root_page.path, []
+    )
+    items = {root.path: root}
+    for page_id, title, url_path, path in pages:
+        # Ordered by path, so the parent (if it's in the menu) is already there
+        parent = items.get(path[:-Page.steplen])
+        if parent is not None:
+            item = NavigationItem(page_id, title, get_page_path(root_page.url_path, url_path), path, [])
+            parent.children.append(item)
+            items[path] = item
+    return root.children
+
+
+def get_navigation_tree(site, depth=None):
+    """Return the navigation items of the site, cached until a page is (un)published or moved"""
+
+    if depth is None:
+        depth = settings.NAVIGATION_DEPTH
+    return cache.get_or_set(
+        get_navigation_key(site, depth),
+        lambda: build_navigation_tree(site.root_page, depth),
+        settings.NAVIGATION_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,37 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from wagtail.wagtailcore.models import Page
+from wagtail.wagtailcore.signals import page_published, page_unpublished
+
+from ..cache import bump_generation
+
+
+@receiver([page_published, page_unpublished])
+def page_tree_changed(sender, **kwargs):
+    """Invalidate data cached for the live pages, e.g. cached pages and search results
+
+    Only once the transaction is committed, otherwise another process could
+    cache the old pages under the new generation.
+
+    """
+    transaction.on_commit(lambda: bump_generation('pages'))
+
+
+@receiver(post_save, sender=Page)
+def page_moved(sender, update_fields=None, **kwargs):
+    """Page.move() saves the moved page as a plain Page, without update_fields"""
+
+    if update_fields is None:
+        transaction.on_commit(lambda: bump_generation('pages'))
+
+
+@receiver(post_delete)
+def page_deleted(sender, instance, **kwargs):
+    """Deleting a live page doesn't send page_unpublished"""
+
+    if isinstance(instance, Page):
+        transaction.on_commit(lambda: bump_generation('pages'))
@@ -0,0 +1,28 @@
+from __future__ import absolute_import, unicode_literals
+
+from django import template
+
+from wagtail.wagtailcore.models import Page
+
+from ..navigation import get_navigation_tree
+
+register = template.Library()
+
+
+@register.inclusion_tag('pages/tags/navigation.html', takes_context=True)
+def navigation(context, depth=None):
+    """Render the navigation of the site, the current page and its ancestors are marked as active"""
+
+    site = context.get('site') or getattr(context.get('request'), 'site', None)
+    if site is None:
+        return {'items': []}
+
+    page = context.get('page')
+    active_paths = set()
+    if isinstance(page, Page):
+        active_paths = set(page.path[:end] for end in range(Page.steplen, len(page.path) + 1, Page.steplen))
+
+    return {
+        'items': get_navigation_tree(site, depth),
+        'active_paths': active_paths,
+    }
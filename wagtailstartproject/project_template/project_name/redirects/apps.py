@@ -0,0 +1,10 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.apps import AppConfig
+
+
+class RedirectsConfig(AppConfig):
+    name = '{{ project_name }}.redirects'
+
+    def ready(self):
+        from . import signals  # noqa: F401
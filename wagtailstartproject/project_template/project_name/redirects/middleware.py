@@ -0,0 +1,32 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.http import HttpResponsePermanentRedirect, HttpResponseRedirect
+
+from .table import redirect_table
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    MiddlewareMixin = object
+
+
+class RedirectMiddleware(MiddlewareMixin):
+    """Wagtail's RedirectMiddleware, with the redirects in memory instead of a query per 404
+
+    Note: Place this middleware after the site middleware.
+
+    """
+
+    def process_response(self, request, response):
+        if response.status_code != 404:
+            return response
+
+        # Without a site (e.g. an unknown hostname and no default site) the redirects for all sites apply
+        redirect = redirect_table.find(getattr(request, 'site', None), request.get_full_path())
+        if redirect is None:
+            return response
+
+        link, is_permanent = redirect
+        if is_permanent:
+            return HttpResponsePermanentRedirect(link)
+        return HttpResponseRedirect(link)
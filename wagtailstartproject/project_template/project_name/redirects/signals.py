@@ -0,0 +1,15 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from wagtail.wagtailredirects.models import Redirect
+
+from ..cache import bump_generation
+
+
+@receiver([post_save, post_delete], sender=Redirect)
+def redirects_changed(sender, **kwargs):
+    """Rebuild the redirect tables of all processes"""
+
+    bump_generation('redirects')
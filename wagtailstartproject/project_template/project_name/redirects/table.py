@@ -0,0 +1,112 @@
+from __future__ import absolute_import, unicode_literals
+
+import threading
+
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.encoding import uri_to_iri
+from django.utils.six.moves.urllib.parse import urlparse
+
+from wagtail.wagtailredirects.models import Redirect
+
+from ..cache import get_generation
+
+
+def get_redirect_table_key():
+    """Return the cache key of the current redirect table, None if the cache can't keep track of changes"""
+
+    # Redirects to pages follow the pages when they are moved
+    redirects_generation, pages_generation = get_generation('redirects'), get_generation('pages')
+    if redirects_generation is None or pages_generation is None:
+        return None
+    return 'redirects:{redirects}:{pages}'.format(redirects=redirects_generation, pages=pages_generation)
+
+
+def build_redirect_table():
+    """Return {old path: {site id (None for all sites): (link, is permanent)}} for all redirects"""
+
+    table = {}
+    for redirect in Redirect.objects.select_related('redirect_page'):
+        link = redirect.link
+        if link:
+            table.setdefault(redirect.old_path, {})[redirect.site_id] = (link, redirect.is_permanent)
+    return table
+
+
+class RedirectTable(object):
+
+    """
+    The redirects of all sites, kept in memory by every process.
+
+    The table is built with one query by the first process that needs it and
+    shared through the cache. When a redirect is saved or deleted (or a page
+    is moved) the processes load the new table, until then finding a
+    redirect costs no queries.
+
+    Lookups of the same full path are remembered in a small LRU, so repeated
+    404s (e.g. bots probing urls) don't normalise the path again.
+
+    """
+
+    def __init__(self, max_lookups=1000):
+        self.max_lookups = max_lookups
+        self.key = None
+        self.table = {}
+        self.lookups = OrderedDict()
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        key = get_redirect_table_key()
+        if key is None:
+            # Without a cache (e.g. DummyCache in tests) changes can't be noticed, rebuild the table every time
+            table = build_redirect_table()
+        elif key == self.key:
+            return
+        else:
+            table = cache.get_or_set(key, build_redirect_table, settings.REDIRECT_TABLE_TIMEOUT)
+        with self.lock:
+            self.key, self.table = key, table
+            self.lookups.clear()
+
+    def find(self, site, full_path):
+        """Return (link, is permanent) of the redirect for the path on the site, or None
+
+        Without a site only the redirects for all sites apply.
+
+        """
+        self.refresh()
+        site_id = site.pk if site else None
+        lookup_key = (site_id, full_path)
+        with self.lock:
+            if lookup_key in self.lookups:
+                self.lookups.move_to_end(lookup_key)
+                return self.lookups[lookup_key]
+
+        redirect = self.lookup(site_id, full_path)
+        with self.lock:
+            self.lookups[lookup_key] = redirect
+            while len(self.lookups) > self.max_lookups:
+                self.lookups.popitem(last=False)
+        return redirect
+
+    def lookup(self, site_id, full_path):
+        """Find the redirect like Wagtail's RedirectMiddleware, with and without the query string"""
+
+        path = Redirect.normalise_path(full_path)
+        paths = [path, uri_to_iri(path)]
+        path_without_query = urlparse(path).path
+        if path_without_query != path:
+            paths.extend([path_without_query, uri_to_iri(path_without_query)])
+
+        for candidate in paths:
+            redirects = self.table.get(candidate, {})
+            # Site-specific redirects win over those for all sites
+            redirect = redirects.get(site_id) or redirects.get(None)
+            if redirect is not None:
+                return redirect
+        return None
+
+
+redirect_table = RedirectTable()
@@ -0,0 +1,50 @@
+from __future__ import absolute_import, unicode_literals
+
+import operator
+
+from functools import reduce
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+from wagtail.wagtailcore.models import Page
+from wagtail.wagtailsearch.backends.db import DatabaseSearchBackend, DatabaseSearchResults
+
+# Text search configuration of the search vectors, see migration 0001
+SEARCH_CONFIG = 'english'
+
+
+class PostgresSearchResults(DatabaseSearchResults):
+    """Search pages using their GIN indexed search vectors
+
+    The pages match all words of the query, or any word with operator='or'.
+    Searching specific fields, and other models (e.g. images and documents in
+    the admin), is done by the database backend.
+
+    """
+
+    def get_queryset(self):
+        queryset = self.query.queryset
+        if not issubclass(queryset.model, Page) or not self.query.query_string or self.query.fields:
+            return super(PostgresSearchResults, self).get_queryset()
+
+        search_query = self.get_search_query()
+        queryset = queryset.filter(search_vector__vector=search_query)
+        if self.query.order_by_relevance:
+            queryset = queryset.annotate(
+                search_rank=SearchRank(F('search_vector__vector'), search_query),
+            ).order_by('-search_rank', 'pk')
+        return queryset[self.start:self.stop]
+
+    def get_search_query(self):
+        words = self.query.query_string.split()
+        if self.query.operator == 'or' and len(words) > 1:
+            return reduce(operator.or_, (SearchQuery(word, config=SEARCH_CONFIG) for word in words))
+        return SearchQuery(self.query.query_string, config=SEARCH_CONFIG)
+
+
+class PostgresSearchBackend(DatabaseSearchBackend):
+    results_class = PostgresSearchResults
+
+
+SearchBackend = PostgresSearchBackend
@@ -0,0 +1,50 @@
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from wagtail.wagtailcore.models import Page
+from wagtail.wagtailsearch.utils import normalise_query_string
+
+from ..cache import get_generation
+
+
+def get_search_cache_key(site, query_string):
+    return 'search:{generation}:{site_id}:{query}'.format(
+        generation=get_generation('pages'),
+        site_id=site.pk if site else '',
+        query=hashlib.md5(query_string.encode('utf-8')).hexdigest(),
+    )
+
+
+def search_page_ids(site, query_string):
+    """Return the ordered ids of the live pages matching the query
+
+    The results are cached per site and normalised query, and shared by all
+    pages of the paginated results. Publishing, unpublishing or moving a page
+    starts a new 'pages' generation, which invalidates all cached results.
+
+    """
+    query_string = normalise_query_string(query_string)
+    if not query_string:
+        return []
+
+    key = get_search_cache_key(site, query_string)
+    page_ids = cache.get(key)
+    if page_ids is None:
+        pages = Page.objects.live()
+        if site:
+            pages = pages.descendant_of(site.root_page, inclusive=True)
+        results = pages.search(query_string)[:settings.SEARCH_RESULTS_LIMIT]
+        page_ids = [page.pk for page in results]
+        cache.set(key, page_ids, settings.SEARCH_RESULTS_CACHE_TIMEOUT)
+    return page_ids
+
+
+def get_pages(page_ids):
+    """Return the live pages for the given ids, in the same order"""
+
+    pages = Page.objects.live().in_bulk(page_ids)
+    return [pages[page_id] for page_id in page_ids if page_id in pages]
@@ -0,0 +1,113 @@
+from __future__ import absolute_import, unicode_literals
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from wagtail.wagtailsearch.models import Query, QueryDailyHits
+from wagtail.wagtailsearch.utils import normalise_query_string
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_hits = Counter()
+_flusher_pid = None
+
+
+def record_hit(query_string):
+    """Count a search hit for the query, to be written by the next flush
+
+    Hits are buffered per process and flushed every SEARCH_HITS_FLUSH_INTERVAL
+    seconds by a background thread, or immediately if the interval is 0.
+
+    """
+    query_string = normalise_query_string(query_string)
+    if not query_string:
+        return
+
+    if settings.SEARCH_HITS_FLUSH_INTERVAL:
+        # Before counting the hit, starting the flusher drops the hits inherited from the parent process
+        start_flusher()
+
+    with _lock:
+        _hits[query_string, timezone.now().date()] += 1
+
+    if not settings.SEARCH_HITS_FLUSH_INTERVAL:
+        flush_hits()
+
+
+def flush_hits():
+    """Write the buffered hits, aggregated per query per day"""
+
+    with _lock:
+        hits = dict(_hits)
+        _hits.clear()
+
+    if hits:
+        write_hits(hits)
+
+
+def write_hits(hits):
+    query_strings = set(query_string for query_string, date in hits)
+    queries = {query.query_string: query for query in Query.objects.filter(query_string__in=query_strings)}
+    for query_string in query_strings - set(queries):
+        queries[query_string] = Query.get(query_string)
+
+    for (query_string, date), count in hits.items():
+        query = queries[query_string]
+        daily_hits = QueryDailyHits.objects.filter(query=query, date=date)
+        if daily_hits.update(hits=F('hits') + count):
+            continue
+        try:
+            with transaction.atomic():
+                QueryDailyHits.objects.create(query=query, date=date, hits=count)
+        except IntegrityError:
+            # Created by another process in the meantime
+            daily_hits.update(hits=F('hits') + count)
+
+
+def start_flusher():
+    """Start the background flush thread, once in every (forked) process"""
+
+    global _flusher_pid
+
+    if _flusher_pid == os.getpid():
+        return
+
+    with _lock:
+        if _flusher_pid != os.getpid():
+            _hits.clear()  # Hits inherited from the parent process are flushed by the parent
+            thread = threading.Thread(target=run_flusher, name='search-hits-flusher')
+            thread.daemon = True
+            thread.start()
+            # Set last, other threads only skip the lock once the inherited hits are gone
+            _flusher_pid = os.getpid()
+
+
+def run_flusher():
+    while True:
+        time.sleep(settings.SEARCH_HITS_FLUSH_INTERVAL)
+        try:
+            flush_hits()
+        except Exception:
+            logger.exception('Unable to write search hits')
+        finally:
+            connections.close_all()
+
+
+@atexit.register
+def flush_hits_at_exit():
+    if _flusher_pid == os.getpid():
+        try:
+            flush_hits()
+        except Exception:
+            logger.exception('Unable to write search hits')
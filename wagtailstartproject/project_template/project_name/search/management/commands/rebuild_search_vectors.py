@@ -0,0 +1,47 @@
+from time import time
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+
+REBUILD_BATCH = """
+INSERT INTO search_pagesearchvector (page_id, vector)
+    SELECT id, search_page_vector(title, seo_title, search_description)
+    FROM wagtailcore_page
+    WHERE id > %s
+    ORDER BY id
+    LIMIT %s
+ON CONFLICT (page_id) DO UPDATE SET vector = EXCLUDED.vector
+RETURNING page_id
+"""
+
+
+class Command(BaseCommand):
+    help = "(Re)build the full text search vectors of all pages in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='number of pages to update per transaction (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        start = time()
+        last_id = 0
+        total = 0
+
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(REBUILD_BATCH, [last_id, options['batch_size']])
+                page_ids = [row[0] for row in cursor.fetchall()]
+            if not page_ids:
+                break
+
+            last_id = max(page_ids)
+            total += len(page_ids)
+            self.stdout.write('Updated {total} pages'.format(total=total))
+
+        self.stdout.write(self.style.SUCCESS(
+            'Rebuilt the search vectors of {total} pages in {seconds:.1f}s'.format(total=total, seconds=time() - start)
+        ))
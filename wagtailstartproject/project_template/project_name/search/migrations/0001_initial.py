@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+
+from django.db import migrations, models
+
+# Keep the text search configuration in sync with SEARCH_CONFIG in search/backend.py
+CREATE_TRIGGER = """
+CREATE FUNCTION search_page_vector(title text, seo_title text, search_description text) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(seo_title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(search_description, '')), 'B');
+$$ LANGUAGE SQL IMMUTABLE;
+
+CREATE FUNCTION search_update_page_vector() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO search_pagesearchvector (page_id, vector)
+    VALUES (NEW.id, search_page_vector(NEW.title, NEW.seo_title, NEW.search_description))
+    ON CONFLICT (page_id) DO UPDATE SET vector = EXCLUDED.vector;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER search_page_vector_update
+    AFTER INSERT OR UPDATE OF title, seo_title, search_description ON wagtailcore_page
+    FOR EACH ROW EXECUTE PROCEDURE search_update_page_vector();
+
+INSERT INTO search_pagesearchvector (page_id, vector)
+    SELECT id, search_page_vector(title, seo_title, search_description) FROM wagtailcore_page;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER search_page_vector_update ON wagtailcore_page;
+DROP FUNCTION search_update_page_vector();
+DROP FUNCTION search_page_vector(text, text, text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('wagtailcore', '0029_unicode_slugfield_dj19'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageSearchVector',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_vector', serialize=False, to='wagtailcore.Page')),
+                ('vector', django.contrib.postgres.search.SearchVectorField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='pagesearchvector',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['vector'], name='search_page_vector_gin'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,28 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class PageSearchVector(models.Model):
+    """Weighted full text search vector of a page
+
+    The vectors are maintained by a database trigger on the wagtailcore_page
+    table (see migration 0001), use the rebuild_search_vectors command to
+    (re)build them for existing pages.
+
+    """
+
+    page = models.OneToOneField(
+        'wagtailcore.Page',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_vector',
+    )
+    vector = SearchVectorField()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['vector'], name='search_page_vector_gin'),
+        ]
@@ -0,0 +1,71 @@
+from __future__ import absolute_import, unicode_literals
+
+
+class SearchPaginator(object):
+    """Paginate search results without counting them
+
+    Only per_page + 1 results are fetched to find out if there is a next page,
+    and the page number is capped at max_pages, so invalid or very high page
+    numbers never lead to a scan of all results.
+
+    """
+
+    def __init__(self, object_list, per_page, max_pages):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.max_pages = max_pages
+
+    def validate_number(self, number):
+        """Return the given page number, or the nearest valid page number"""
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return 1
+        return min(max(number, 1), self.max_pages)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not objects and number > 1:
+            # Out of range, the number of results is unknown so start over
+            return self.page(1)
+        has_next = len(objects) > self.per_page and number < self.max_pages
+        return SearchPage(objects[:self.per_page], number, has_next)
+
+
+class SearchPage(object):
+    """A page of search results, compatible with Django's Page in templates"""
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def __repr__(self):
+        return '<Page {number}>'.format(number=self.number)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
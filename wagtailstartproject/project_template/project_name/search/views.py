@@ -1,10 +1,13 @@
 from __future__ import absolute_import, unicode_literals
 
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.conf import settings
 from django.shortcuts import render
 
-from wagtail.wagtailcore.models import Page
-from wagtail.wagtailsearch.models import Query
+from .cache import get_pages, search_page_ids
+from .hits import record_hit
+from .paginator import SearchPaginator
+
+RESULTS_PER_PAGE = 10
 
 
 def search(request):
@@ -13,22 +16,20 @@ def search(request):
 
     # Search
     if search_query:
-        search_results = Page.objects.live().search(search_query)
-        query = Query.get(search_query)
+        page_ids = search_page_ids(getattr(request, 'site', None), search_query)
 
         # Record hit
-        query.add_hit()
+        record_hit(search_query)
     else:
-        search_results = Page.objects.none()
+        page_ids = []
 
     # Pagination
-    paginator = Paginator(search_results, 10)
-    try:
-        search_results = paginator.page(page)
-    except PageNotAnInteger:
-        search_results = paginator.page(1)
-    except EmptyPage:
-        search_results = paginator.page(paginator.num_pages)
+    max_pages = settings.SEARCH_RESULTS_LIMIT // RESULTS_PER_PAGE
+    paginator = SearchPaginator(page_ids, RESULTS_PER_PAGE, max_pages)
+    search_results = paginator.page(page)
+
+    # Only fetch the pages shown on the current page of results
+    search_results.object_list = get_pages(search_results.object_list)
 
     return render(request, 'search/search.html', {
         'search_query': search_query,
@@ -48,6 +48,8 @@ INSTALLED_APPS = [
     '{{ project_name }}',
     '{{ project_name }}.pages',
     '{{ project_name }}.search',
+    '{{ project_name }}.redirects',
+    '{{ project_name }}.sites',
 
     'wagtail.wagtailforms',
     'wagtail.wagtailredirects',
@@ -74,7 +76,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    '{{ project_name }}.staticfiles.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -82,8 +84,10 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
-    'wagtail.wagtailcore.middleware.SiteMiddleware',
-    'wagtail.wagtailredirects.middleware.RedirectMiddleware',
+    '{{ project_name }}.sites.middleware.SiteMiddleware',
+    '{{ project_name }}.redirects.middleware.RedirectMiddleware',
+
+    '{{ project_name }}.pages.middleware.PageCacheMiddleware',
 ]
 
 ROOT_URLCONF = '{{ project_name }}.urls'
@@ -94,6 +98,7 @@ TEMPLATES = [
         'DIRS': [
             os.path.join(PACKAGE_DIR, 'templates'),
         ],
+        # Outside debug mode templates are compiled once per process (Django's cached loader)
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -101,27 +106,80 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+
+                '{{ project_name }}.context_processors.fragment_cache',
+                '{{ project_name }}.context_processors.site',
             ],
         },
     },
 ]
 
+# Timeout for the cached fragments in templates (in seconds)
+# The fragments are keyed on site and/or page publication, so they don't go stale when pages are published
+FRAGMENT_CACHE_TIMEOUT = 0 if DEBUG else 60 * 60
+
 WSGI_APPLICATION = '{{ project_name }}.wsgi.application'
 
+# Threads of the ASGI application ({{ project_name }}/asgi.py), searches run in their own pool
+ASGI_THREADS = config.getint('app', 'asgi_threads', fallback=20)
+ASGI_SEARCH_THREADS = config.getint('app', 'asgi_search_threads', fallback=4)
+
+# Warm up the application when the WSGI module is imported, see {{ project_name }}/warmup.py
+# Freezing the garbage collector after the warm-up (Python 3.7+) keeps memory shared with forked workers
+WARMUP = config.getboolean('app', 'warmup', fallback=False)
+WARMUP_GC_FREEZE = config.getboolean('app', 'warmup_gc_freeze', fallback=False)
+
 
 # Database
 # https://docs.djangoproject.com/en/{{ docs_version }}/ref/settings/#databases
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        # PostgreSQL with optional connection pooling and health checks, see {{ project_name }}/db/base.py
+        'ENGINE': '{{ project_name }}.db',
         'HOST': config.getliteral('app', 'db_host', fallback=''),
         'NAME': config.getliteral('app', 'db_name'),
         'USER': config.getliteral('app', 'db_user'),
         'PASSWORD': config.getliteral('app', 'db_password'),
+        'CONN_MAX_AGE': config.getint('app', 'db_conn_max_age', fallback=0),
+        'CONN_HEALTH_CHECKS': config.getboolean('app', 'db_conn_health_checks', fallback=False),
+        'POOL_SIZE': config.getint('app', 'db_pool_size', fallback=0),
+        'OPTIONS': {},
     }
 }
 
+DB_STATEMENT_TIMEOUT = config.getint('app', 'db_statement_timeout', fallback=0)
+if DB_STATEMENT_TIMEOUT:
+    # Abort queries that take longer than the timeout (in milliseconds)
+    DATABASES['default']['OPTIONS']['options'] = '-c statement_timeout={timeout}'.format(timeout=DB_STATEMENT_TIMEOUT)
+
+
+# Cache
+# https://docs.djangoproject.com/en/{{ docs_version }}/topics/cache/
+
+# A small per-process cache in front of a cache shared by all processes and servers.
+# Changes to cached values can take LOCAL_TIMEOUT seconds to show up in other processes.
+CACHE_BACKENDS = {
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'memcached': 'django.core.cache.backends.memcached.MemcachedCache',  # Requires python-memcached
+    'redis': 'django_redis.cache.RedisCache',  # Requires django-redis
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': '{{ project_name }}.cache.TieredCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+            'LOCAL_TIMEOUT': 5,
+        },
+    },
+    'shared': {
+        'BACKEND': CACHE_BACKENDS[config.getliteral('app', 'cache_backend', fallback='file')],
+        'LOCATION': config.getliteral('app', 'cache_location', fallback=os.path.join(BASE_DIR, 'var', 'cache')),
+    },
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/{{ docs_version }}/topics/i18n/
@@ -156,7 +214,8 @@ if DEBUG:
 else:
     # Require STATIC_ROOT to be configured
     STATIC_ROOT = config.getliteral('app', 'static_root')
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+    # Only changed files are compressed by collectstatic (gzip and Brotli), see {{ project_name }}/staticfiles.py
+    STATICFILES_STORAGE = '{{ project_name }}.staticfiles.CompressedManifestStaticFilesStorage'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
@@ -166,6 +225,56 @@ MEDIA_URL = '/media/'
 
 WAGTAIL_SITE_NAME = "{{ project_name }}"
 
+# Cache the pages served by Wagtail for anonymous visitors (in seconds, 0 disables the cache)
+# All pages are purged from the cache when a page is (un)published, moved or deleted
+PAGE_CACHE_TIMEOUT = config.getint('app', 'page_cache_timeout', fallback=0 if DEBUG else 600)
+
+# Request headers the cached pages vary on, in addition to those in the Vary header of the response
+# e.g. ['Accept-Language'] when pages are translated with LocaleMiddleware
+PAGE_CACHE_VARY_HEADERS = []
+
+# Cache-Control of the pages for anonymous visitors (arguments of django.utils.cache.patch_cache_control)
+# Page types can set their own with a cache_control attribute
+PAGE_CACHE_CONTROL = {'public': True, 'max_age': 0 if DEBUG else 60 * 5}
+
+# Part of the ETag of pages, change it when a deploy changes how pages are rendered
+TEMPLATE_VERSION = config.getliteral('app', 'template_version', fallback='1')
+
+# Number of search results to cache per query, and how long to cache them (in seconds)
+# Cached results are invalidated when pages are (un)published or moved
+SEARCH_RESULTS_LIMIT = 1000
+SEARCH_RESULTS_CACHE_TIMEOUT = 60 * 60
+
+# Search hits are counted in memory and written to the database every SEARCH_HITS_FLUSH_INTERVAL seconds
+# Set to 0 to write every hit immediately
+SEARCH_HITS_FLUSH_INTERVAL = 60
+
+# The sitemap index (/sitemap.xml) links to a sitemap per page type and chunk of SITEMAP_CHUNK_SIZE pages
+# Sitemaps are cached until pages are (un)published or moved, crawlers may cache them for SITEMAP_MAX_AGE seconds
+SITEMAP_CHUNK_SIZE = 10000
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+SITEMAP_MAX_AGE = 60 * 60
+
+# The redirects are kept in memory, the table is rebuilt when a redirect is saved or deleted or a page is moved
+REDIRECT_TABLE_TIMEOUT = 60 * 60 * 24
+
+# The sites are kept in memory, the table is rebuilt when a site is saved or deleted or a page is published or moved
+SITE_TABLE_TIMEOUT = 60 * 60 * 24
+
+# The number of levels below the root page in the navigation, which is cached until pages are (un)published or moved
+NAVIGATION_DEPTH = 2
+NAVIGATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Image renditions generated by './manage.py generate_renditions', next to those of the templates' image tags
+IMAGE_RENDITION_FILTER_SPECS = []
+
+# Search pages with PostgreSQL full text search, see search/backend.py
+WAGTAILSEARCH_BACKENDS = {
+    'default': {
+        'BACKEND': '{{ project_name }}.search.backend',
+    },
+}
+
 # Base URL to use when referring to full URLs within the Wagtail admin backend -
 # e.g. in notification emails. Don't include '/admin' or a trailing slash
 # BASE_URL = 'http://example.com'
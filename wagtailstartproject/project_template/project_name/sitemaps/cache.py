@@ -0,0 +1,66 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.functions import Coalesce
+
+from wagtail.wagtailcore.models import Page
+
+from ..cache import get_generation
+from ..pages.cache import get_page_path
+
+
+def get_sitemap_pages(site):
+    """Return the live, public pages of the site"""
+
+    return Page.objects.live().public().descendant_of(site.root_page, inclusive=True)
+
+
+def get_sitemap_key(site, name):
+    return 'sitemap:{generation}:{site_id}:{name}'.format(
+        generation=get_generation('pages'), site_id=site.pk, name=name
+    )
+
+
+def get_sitemap_index(site):
+    """Return the sections of the sitemap: (page type label, chunk number, last modification)
+
+    The pages are split per page type, in chunks of SITEMAP_CHUNK_SIZE pages.
+    The index is built with one aggregate query and cached until a page is
+    (un)published or moved.
+
+    """
+    def build_index():
+        counts = get_sitemap_pages(site).order_by().values('content_type').annotate(
+            count=Count('pk'), lastmod=Max(Coalesce('last_published_at', 'first_published_at'))
+        )
+        index = []
+        for row in counts:
+            label = ContentType.objects.get_for_id(row['content_type']).model_class()._meta.label_lower
+            chunks = (row['count'] + settings.SITEMAP_CHUNK_SIZE - 1) // settings.SITEMAP_CHUNK_SIZE
+            index.extend((label, chunk, row['lastmod']) for chunk in range(1, chunks + 1))
+        return sorted(index)
+
+    return cache.get_or_set(get_sitemap_key(site, 'index'), build_index, settings.SITEMAP_CACHE_TIMEOUT)
+
+
+def get_sitemap_urls(site, model, chunk):
+    """Return the url and last modification of the pages in a chunk of the sitemap
+
+    The last modification is the last time the page was published, drafts
+    don't change the live page.
+
+    """
+
+    offset = (chunk - 1) * settings.SITEMAP_CHUNK_SIZE
+    content_type = ContentType.objects.get_for_model(model)
+    rows = get_sitemap_pages(site).filter(content_type=content_type).order_by('path').values_list(
+        'url_path', 'last_published_at', 'first_published_at'
+    )[offset:offset + settings.SITEMAP_CHUNK_SIZE]
+
+    root_path = site.root_page.url_path
+    for url_path, last_published_at, first_published_at in rows.iterator():
+        url = site.root_url + get_page_path(root_path, url_path)
+        yield url, last_published_at or first_published_at
@@ -0,0 +1,90 @@
+from __future__ import absolute_import, unicode_literals
+
+from xml.sax.saxutils import escape
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+
+from wagtail.wagtailcore.models import Page
+
+from .cache import get_sitemap_index, get_sitemap_key, get_sitemap_urls
+
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def format_lastmod(lastmod):
+    if lastmod is None:
+        return ''
+    return '<lastmod>{lastmod}</lastmod>'.format(lastmod=lastmod.isoformat())
+
+
+def index(request):
+    """The sitemap index, with a sitemap per page type and chunk"""
+
+    site = getattr(request, 'site', None)
+    if site is None:
+        raise Http404
+
+    lines = [XML_DECLARATION, '<sitemapindex xmlns="{namespace}">\n'.format(namespace=SITEMAP_NAMESPACE)]
+    for label, chunk, lastmod in get_sitemap_index(site):
+        location = site.root_url + reverse('sitemap', kwargs={'label': label, 'chunk': chunk})
+        lines.append('<sitemap><loc>{location}</loc>{lastmod}</sitemap>\n'.format(
+            location=escape(location), lastmod=format_lastmod(lastmod)
+        ))
+    lines.append('</sitemapindex>\n')
+
+    return cached_for_crawlers(HttpResponse(''.join(lines), content_type=CONTENT_TYPE))
+
+
+def sitemap(request, label, chunk):
+    """A chunk of the pages of one page type
+
+    The XML is streamed while it is generated and cached afterwards, until a
+    page is (un)published or moved.
+
+    """
+    site = getattr(request, 'site', None)
+    chunk = int(chunk)
+    if site is None or not any(entry[:2] == (label, chunk) for entry in get_sitemap_index(site)):
+        raise Http404
+
+    key = get_sitemap_key(site, '{label}:{chunk}'.format(label=label, chunk=chunk))
+    content = cache.get(key)
+    if content is not None:
+        return cached_for_crawlers(HttpResponse(content, content_type=CONTENT_TYPE))
+
+    model = apps.get_model(label)
+    if not issubclass(model, Page):
+        raise Http404
+
+    def generate():
+        yield XML_DECLARATION
+        yield '<urlset xmlns="{namespace}">\n'.format(namespace=SITEMAP_NAMESPACE)
+        for location, lastmod in get_sitemap_urls(site, model, chunk):
+            yield '<url><loc>{location}</loc>{lastmod}</url>\n'.format(
+                location=escape(location), lastmod=format_lastmod(lastmod)
+            )
+        yield '</urlset>\n'
+
+    return cached_for_crawlers(StreamingHttpResponse(cache_when_done(key, generate()), content_type=CONTENT_TYPE))
+
+
+def cache_when_done(key, chunks):
+    """Pass the chunks through, and cache the content when all chunks were generated"""
+
+    content = []
+    for chunk in chunks:
+        content.append(chunk)
+        yield chunk
+    cache.set(key, ''.join(content), settings.SITEMAP_CACHE_TIMEOUT)
+
+
+def cached_for_crawlers(response):
+    patch_cache_control(response, public=True, max_age=settings.SITEMAP_MAX_AGE)
+    return response
@@ -0,0 +1,10 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.apps import AppConfig
+
+
+class SitesConfig(AppConfig):
+    name = '{{ project_name }}.sites'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,20 @@
+from __future__ import absolute_import, unicode_literals
+
+from wagtail.wagtailcore.models import Site
+
+from .table import site_table
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    MiddlewareMixin = object
+
+
+class SiteMiddleware(MiddlewareMixin):
+    """Wagtail's SiteMiddleware, with the sites in memory instead of a query per request"""
+
+    def process_request(self, request):
+        try:
+            request.site = site_table.find_for_request(request)
+        except Site.DoesNotExist:
+            request.site = None
@@ -0,0 +1,15 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from wagtail.wagtailcore.models import Site
+
+from ..cache import bump_generation
+
+
+@receiver([post_save, post_delete], sender=Site)
+def sites_changed(sender, **kwargs):
+    """Rebuild the site tables of all processes"""
+
+    bump_generation('sites')
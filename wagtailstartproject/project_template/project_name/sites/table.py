@@ -0,0 +1,120 @@
+from __future__ import absolute_import, unicode_literals
+
+import copy
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from wagtail.wagtailcore.models import Site
+from wagtail.wagtailcore.sites import MATCH_DEFAULT, MATCH_HOSTNAME, MATCH_HOSTNAME_DEFAULT, MATCH_HOSTNAME_PORT
+
+from ..cache import get_generation
+
+
+def get_site_table_key():
+    """Return the cache key of the current site table, None if the cache can't keep track of changes"""
+
+    # The root pages are part of the table, their url_path changes when they are moved
+    sites_generation, pages_generation = get_generation('sites'), get_generation('pages')
+    if sites_generation is None or pages_generation is None:
+        return None
+    return 'sites:{sites}:{pages}'.format(sites=sites_generation, pages=pages_generation)
+
+
+def build_site_table():
+    """Return {hostname: [sites]} and the default site"""
+
+    sites_by_hostname = {}
+    default_site = None
+    for site in Site.objects.select_related('root_page').order_by('pk'):
+        sites_by_hostname.setdefault(site.hostname, []).append(site)
+        if site.is_default_site:
+            default_site = site
+    return sites_by_hostname, default_site
+
+
+def get_match(site, hostname, port):
+    if site.hostname != hostname:
+        return MATCH_DEFAULT
+    if str(site.port) == str(port):
+        return MATCH_HOSTNAME_PORT
+    if site.is_default_site:
+        return MATCH_HOSTNAME_DEFAULT
+    return MATCH_HOSTNAME
+
+
+class SiteTable(object):
+
+    """
+    The sites (with their root pages) kept in memory by every process.
+
+    The table is built with one query by the first process that needs it and
+    shared through the cache. When a site is saved or deleted (or a page is
+    published or moved) the processes load the new table, until then finding
+    the site of a request costs no queries.
+
+    """
+
+    def __init__(self):
+        self.key = None
+        self.sites_by_hostname = {}
+        self.default_site = None
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        key = get_site_table_key()
+        if key is None:
+            # Without a cache (e.g. DummyCache in tests) changes can't be noticed, rebuild the table every time
+            sites_by_hostname, default_site = build_site_table()
+        elif key == self.key:
+            return
+        else:
+            sites_by_hostname, default_site = cache.get_or_set(key, build_site_table, settings.SITE_TABLE_TIMEOUT)
+        with self.lock:
+            self.key, self.sites_by_hostname, self.default_site = key, sites_by_hostname, default_site
+
+    def find(self, hostname, port):
+        """Return the site for the hostname and port, with the same rules as Site.find_for_request
+
+        Raises Site.DoesNotExist if there is no matching site and no default site.
+
+        """
+        self.refresh()
+        sites = list(self.sites_by_hostname.get(hostname, []))
+        if self.default_site is not None and self.default_site.hostname != hostname:
+            sites.append(self.default_site)
+        if not sites:
+            raise Site.DoesNotExist()
+
+        sites.sort(key=lambda site: get_match(site, hostname, port))
+        match = get_match(sites[0], hostname, port)
+        if len(sites) == 1 or match in (MATCH_HOSTNAME_PORT, MATCH_HOSTNAME_DEFAULT):
+            return self.copy(sites[0])
+        if match == MATCH_DEFAULT:
+            # A single site for the hostname wins over the default site
+            return self.copy(sites[len(sites) == 2])
+        raise Site.DoesNotExist()
+
+    def copy(self, site):
+        """Return a copy of the site, so caches on the instances (e.g. root_page.specific) aren't shared"""
+
+        site = copy.copy(site)
+        site.root_page = copy.copy(site.root_page)
+        return site
+
+    def find_for_request(self, request):
+        try:
+            hostname = request.get_host().split(':')[0]
+        except KeyError:
+            hostname = None
+
+        try:
+            port = request.get_port()
+        except (AttributeError, KeyError):
+            port = request.META.get('SERVER_PORT')
+
+        return self.find(hostname, port)
+
+
+site_table = SiteTable()
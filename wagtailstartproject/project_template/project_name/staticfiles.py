@@ -0,0 +1,72 @@
+from __future__ import absolute_import, unicode_literals
+
+from concurrent.futures import ProcessPoolExecutor
+
+from whitenoise.compress import Compressor
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+from whitenoise.storage import HelpfulExceptionMixin
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+
+
+def compress(path):
+    """Write the gzip and Brotli (if the brotli package is installed) versions of the file"""
+
+    Compressor(quiet=True).compress(path)
+
+
+class CompressedManifestStaticFilesStorage(HelpfulExceptionMixin, ManifestStaticFilesStorage):
+
+    """
+    Incremental version of WhiteNoise's CompressedManifestStaticFilesStorage.
+
+    Only the files that changed since the last collectstatic are compressed,
+    in a pool of processes. Files with the same hash as in the previous
+    manifest keep their compressed versions.
+
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        previous_hashed_files = self.load_manifest()
+        hashed_names = {}
+        for name, hashed_name, processed in super(CompressedManifestStaticFilesStorage, self).post_process(
+            paths, dry_run=dry_run, **options
+        ):
+            # CSS files are processed in several passes, the last hashed name is the final one
+            if not isinstance(processed, Exception) and hashed_name is not None:
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+
+        if not dry_run:
+            self.compress_files(previous_hashed_files, hashed_names)
+
+    def compress_files(self, previous_hashed_files, hashed_names):
+        """Compress the files with a hash (i.e. content) that isn't in the previous manifest"""
+
+        extensions = getattr(settings, 'WHITENOISE_SKIP_COMPRESS_EXTENSIONS', None)
+        compressor = Compressor(extensions=extensions, quiet=True)
+
+        paths = []
+        for name, hashed_name in hashed_names.items():
+            if compressor.should_compress(name) and previous_hashed_files.get(self.hash_key(name)) != hashed_name:
+                paths.extend([self.path(name), self.path(hashed_name)])
+
+        with ProcessPoolExecutor() as executor:
+            list(executor.map(compress, paths, chunksize=10))
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+
+    """Serve the hashed files in the staticfiles manifest with far-future, immutable cache headers"""
+
+    hashed_urls = None
+
+    def is_immutable_file(self, path, url):
+        hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+        if not hashed_files:
+            return super(WhiteNoiseMiddleware, self).is_immutable_file(path, url)
+
+        if self.hashed_urls is None:
+            self.hashed_urls = set(self.static_prefix + hashed_name for hashed_name in hashed_files.values())
+        return url in self.hashed_urls
@@ -9,6 +9,7 @@ from wagtail.wagtailcore import urls as wagtail_urls
 from wagtail.wagtaildocs import urls as wagtaildocs_urls
 
 from .search import views as search_views
+from .sitemaps import views as sitemap_views
 
 urlpatterns = [
     url(r'^django-admin/', include(admin.site.urls)),
@@ -18,6 +19,9 @@ urlpatterns = [
 
     url(r'^search/$', search_views.search, name='search'),
 
+    url(r'^sitemap\.xml$', sitemap_views.index, name='sitemap_index'),
+    url(r'^sitemap-(?P<label>\w+\.\w+)-(?P<chunk>\d+)\.xml$', sitemap_views.sitemap, name='sitemap'),
+
     # For anything not caught by a more specific rule above, hand over to
     # Wagtail's page serving mechanism. This should be the last pattern in
     # the list:
@@ -0,0 +1,62 @@
+from __future__ import absolute_import, unicode_literals
+
+import gc
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+from wagtail.wagtailcore.models import Site, get_page_models
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES = [
+    'base.html',
+    'search/search.html',
+    '404.html',
+    '500.html',
+]
+
+
+def warm_up():
+    """Do the work of a first request before the first request comes in
+
+    Run this when the WSGI module is imported. With a pre-forking server that
+    loads the application before forking (e.g. gunicorn --preload), the work is
+    done once and shared by all workers.
+
+    """
+    start = time.time()
+
+    # Compile the URL patterns
+    get_resolver().url_patterns
+    reverse('search')
+
+    # Compile the templates, kept by the cached template loader
+    templates = TEMPLATES + [model.template for model in get_page_models()]
+    for template in templates:
+        try:
+            get_template(template)
+        except TemplateDoesNotExist:
+            pass
+
+    # Load the site root paths into the cache
+    Site.get_site_root_paths()
+
+    # Forked workers can't share database (or cache server) connections
+    connections.close_all()
+    for cache in caches.all():
+        cache.close()
+
+    if settings.WARMUP_GC_FREEZE and hasattr(gc, 'freeze'):
+        # Move everything loaded so far out of reach of the garbage collector,
+        # so collections in the workers don't touch (and copy) the shared memory
+        gc.collect()
+        gc.freeze()
+
+    logger.info('Warm-up finished in %.2fs', time.time() - start)
@@ -11,8 +11,14 @@ from __future__ import absolute_import, unicode_literals
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "{{ project_name }}.settings")
 
 application = get_wsgi_application()
+
+if settings.WARMUP:
+    from .warmup import warm_up
+
+    warm_up()
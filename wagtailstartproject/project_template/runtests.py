@@ -18,7 +18,11 @@ def runtests():
         settings.HEADLESS = False
 
     test_runner = get_runner(settings)
-    failures = test_runner(parallel=args.parallel).run_tests(args.tests)
+    failures = test_runner(
+        parallel=args.parallel,
+        slowest=args.slowest,
+        time_budget=args.time_budget,
+    ).run_tests(args.tests)
     sys.exit(bool(failures))
 
 
@@ -44,6 +48,17 @@ if __name__ == '__main__':
         action='store_true',
         help='do not run headless (checkout tests running onscreen)'
     )
+    parser.add_argument(
+        '--slowest',
+        type=int,
+        default=10,
+        help='number of slowest tests and classes to show, 0 to show none'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        help='fail tests that take longer than this number of seconds (setup and teardown included)'
+    )
 
     args = parser.parse_args()
     runtests()
@@ -23,7 +23,8 @@ setup(
         'Django',
         'wagtail',
         'psycopg2',
-        'whitenoise',
+        'whitenoise<4',
+        'brotli',
     ],
     test_suite='runtests.runtests',
 )
@@ -0,0 +1,17 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase as DjangoTestCase
+
+from .queries import QueryBudgetMixin
+
+
+class TestCase(QueryBudgetMixin, DjangoTestCase):
+
+    """Base class of the unit tests, limit the queries of requests with assert_max_queries"""
+
+    def run_commit_hooks(self, using=DEFAULT_DB_ALIAS):
+        """Run the on_commit callbacks of the test, as if its transaction was committed"""
+
+        connection = connections[using]
+        hooks, connection.run_on_commit = connection.run_on_commit, []
+        for __, hook in hooks:
+            hook()
@@ -3,10 +3,46 @@ try:
 except ImportError:
     MiddlewareMixin = object
 
+from django.db import connection
+
+from .queries import QueryRecorder, request_log
+
+
+def insert_before(chunks, marker, insert):
+    """Insert bytes before the first occurrence of marker in a stream of chunks
+
+    Only the chunks up to the marker are inspected (and copied), the remaining
+    chunks are passed through as is.
+
+    """
+    chunks = iter(chunks)
+    buffer = b''
+    for chunk in chunks:
+        buffer += chunk
+        index = buffer.find(marker)
+        if index != -1:
+            yield buffer[:index] + insert + buffer[index:]
+            break
+        # Hold back the end of the buffer, the marker may continue in the next chunk
+        split = len(buffer) - len(marker) + 1
+        if split > 0:
+            yield buffer[:split]
+            buffer = buffer[split:]
+    else:
+        if buffer:
+            yield buffer
+        return
+
+    for chunk in chunks:
+        yield chunk
+
 
 class PageStatusMiddleware(MiddlewareMixin):
     """Add the response status code as a meta tag in the head of all pages
 
+    Streaming responses are modified lazily, while they are streamed. Non-HTML
+    responses are passed through untouched.
+
     Note: Only enable this middleware for (Selenium) tests
 
     """
@@ -14,15 +50,44 @@ class PageStatusMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
         # Only do this for HTML pages
         # (expecting response['Content-Type'] to be ~ 'text/html; charset=utf-8')
-        if 'html' in response['Content-Type'].lower():
-            response.content = response.content.replace(
-                b'</head>',
-                bytes(
-                    '<meta name="status_code" content="{status_code}" /></head>'.format(status_code=response.status_code),
-                    encoding='ascii'
-                ),
-                1
-            )
-            response['Content-Length'] = str(len(response.content))
+        if 'html' not in response.get('Content-Type', '').lower():
+            return response
+
+        meta = bytes(
+            '<meta name="status_code" content="{status_code}" />'.format(status_code=response.status_code),
+            encoding='ascii'
+        )
+
+        if response.streaming:
+            response.streaming_content = insert_before(response.streaming_content, b'</head>', meta)
+            if response.has_header('Content-Length'):
+                del response['Content-Length']
+        else:
+            content = response.content
+            index = content.find(b'</head>')
+            if index != -1:
+                response.content = b''.join((content[:index], meta, content[index:]))
+                response['Content-Length'] = str(len(response.content))
 
         return response
+
+
+class QueryRecorderMiddleware(MiddlewareMixin):
+    """Record the queries of every request while a test asserts the number of queries
+
+    See tests.queries.QueryBudgetMixin.assert_max_queries.
+
+    Note: Only enable this middleware for tests
+
+    """
+
+    def process_request(self, request):
+        if request_log.active:
+            request._query_recorder = QueryRecorder(connection).__enter__()
+
+    def process_response(self, request, response):
+        recorder = getattr(request, '_query_recorder', None)
+        if recorder is not None:
+            recorder.__exit__(None, None, None)
+            request_log.add(request, recorder.queries)
+        return response
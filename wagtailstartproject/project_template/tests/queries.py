@@ -0,0 +1,216 @@
+import os
+import re
+import sys
+import threading
+
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+
+from django.conf import settings
+
+Query = namedtuple('Query', ['sql', 'template', 'location'])
+RecordedRequest = namedtuple('RecordedRequest', ['method', 'path', 'queries'])
+
+# Placeholder lists of varying length, e.g. IN (%s, %s, %s)
+PLACEHOLDER_LIST = re.compile(r'\((?:%s, )+%s\)')
+NUMBER = re.compile(r'\b\d+\b')
+
+
+def get_query_shape(sql):
+    """Return the query with parameters and numbers replaced, identical shapes are the same query"""
+
+    return NUMBER.sub('N', PLACEHOLDER_LIST.sub('(...)', sql))
+
+
+def get_origin():
+    """Return the template (and line) being rendered and the project code doing the query"""
+
+    template = location = None
+    frame = sys._getframe(2)
+    while frame and not (template and location):
+        code = frame.f_code
+        if template is None and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template = '{name}:{lineno}'.format(name=relative_path(origin.name), lineno=token.lineno)
+        if location is None and is_project_file(code.co_filename):
+            location = '{filename}:{lineno} in {name}'.format(
+                filename=relative_path(code.co_filename),
+                lineno=frame.f_lineno,
+                name=code.co_name,
+            )
+        frame = frame.f_back
+    return template, location
+
+
+def relative_path(filename):
+    if filename.startswith(settings.BASE_DIR):
+        return os.path.relpath(filename, settings.BASE_DIR)
+    return filename
+
+
+def is_project_file(filename):
+    if not filename.startswith(settings.BASE_DIR) or 'site-packages' in filename:
+        return False
+    return filename != __file__
+
+
+class RecordingCursorWrapper(object):
+
+    """Record the queries executed by the wrapped cursor"""
+
+    def __init__(self, cursor, recorder):
+        self.cursor = cursor
+        self.recorder = recorder
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def execute(self, sql, params=None):
+        self.recorder.record(sql)
+        return self.cursor.execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        self.recorder.record(sql)
+        return self.cursor.executemany(sql, param_list)
+
+
+class QueryRecorder(object):
+
+    """
+    Record the queries of a database connection, with the template and code doing them.
+
+    Usage::
+
+        with QueryRecorder(connection) as recorder:
+            ...
+        recorder.queries
+
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.queries = []
+
+    def __enter__(self):
+        self.force_debug_cursor = self.connection.force_debug_cursor
+        self.make_debug_cursor = self.connection.make_debug_cursor
+        self.connection.force_debug_cursor = True
+        self.connection.make_debug_cursor = self.make_recording_cursor
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.force_debug_cursor = self.force_debug_cursor
+        self.connection.make_debug_cursor = self.make_debug_cursor
+
+    def make_recording_cursor(self, cursor):
+        return RecordingCursorWrapper(self.make_debug_cursor(cursor), self)
+
+    def record(self, sql):
+        template, location = get_origin()
+        self.queries.append(Query(sql, template, location))
+
+
+class RequestLog(object):
+
+    """The queries of the requests handled while recording, in any thread (e.g. a live server)"""
+
+    def __init__(self):
+        self.requests = []
+        self.active = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            self.requests = []
+            self.active = True
+
+    def stop(self):
+        with self.lock:
+            self.active = False
+            return self.requests
+
+    def add(self, request, queries):
+        with self.lock:
+            if self.active:
+                self.requests.append(RecordedRequest(request.method, request.get_full_path(), queries))
+
+
+# Filled by tests.middleware.QueryRecorderMiddleware
+request_log = RequestLog()
+
+
+def check_request(recorded, max_queries, max_repeats):
+    """Return the problems with the queries of the request, an empty list if there are none"""
+
+    problems = []
+    if max_queries is not None and len(recorded.queries) > max_queries:
+        problems.append('{method} {path} did {count} queries, the budget is {max_queries}'.format(
+            method=recorded.method, path=recorded.path, count=len(recorded.queries), max_queries=max_queries
+        ))
+
+    selects = [query for query in recorded.queries if query.sql.lstrip().upper().startswith('SELECT')]
+    shapes = Counter(get_query_shape(query.sql) for query in selects)
+    for shape, count in shapes.most_common():
+        if count <= max_repeats:
+            break
+        query = next(query for query in selects if get_query_shape(query.sql) == shape)
+        problems.append('{method} {path} repeated a query {count} times (N+1?):\n    {sql}\n    at {origin}'.format(
+            method=recorded.method,
+            path=recorded.path,
+            count=count,
+            sql=shape,
+            origin=', '.join(origin for origin in (query.template, query.location) if origin) or 'unknown',
+        ))
+    return problems
+
+
+class QueryBudgetMixin(object):
+
+    """
+    Assert the number of queries of the requests made by a test.
+
+    Requires tests.middleware.QueryRecorderMiddleware, the queries are recorded
+    per request in the thread handling the request, e.g. the live server of
+    Selenium tests.
+
+    """
+
+    @contextmanager
+    def assert_max_queries(self, max_queries=None, max_repeats=None):
+        """Fail if a request in the block does more than max_queries queries
+
+        Requests repeating the same query (with different parameters) more
+        than max_repeats times fail too, defaults to the QUERY_REPEAT_LIMIT
+        setting. The failure message shows the template line and project code
+        doing the repeated queries.
+
+        """
+        if max_repeats is None:
+            max_repeats = getattr(settings, 'QUERY_REPEAT_LIMIT', 5)
+
+        request_log.start()
+        try:
+            yield
+        finally:
+            recorded_requests = request_log.stop()
+
+        if not recorded_requests:
+            self.fail('No requests were recorded, is tests.middleware.QueryRecorderMiddleware in MIDDLEWARE?')
+
+        problems = []
+        for recorded in recorded_requests:
+            problems.extend(check_request(recorded, max_queries, max_repeats))
+        if problems:
+            self.fail('\n'.join(problems))
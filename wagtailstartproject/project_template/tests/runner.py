@@ -0,0 +1,282 @@
+import functools
+import json
+import os
+import sys
+import unittest
+
+from collections import defaultdict
+from time import time
+
+from django.conf import settings
+from django.test.runner import (
+    DebugSQLTextTestResult, DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner)
+
+# The methods of a test case that are timed, and the phase they belong to
+TIMED_METHODS = [
+    ('_pre_setup', 'setup'),
+    ('setUp', 'setup'),
+    (None, 'test'),  # The test method
+    ('tearDown', 'teardown'),
+    ('_post_teardown', 'teardown'),
+]
+
+
+def time_test(test, result):
+    """Time the phases of the test by wrapping its methods
+
+    The timings are passed to result.start_timing before the test runs, so the
+    time budget can be checked when the test stops, and to result.add_timing
+    after the last phase (which runs after the test stopped).
+
+    """
+    timings = defaultdict(float)
+    if hasattr(result, 'start_timing'):
+        result.start_timing(test, timings)
+    methods = [(name or test._testMethodName, phase) for name, phase in TIMED_METHODS]
+    methods = [(name, phase) for name, phase in methods if hasattr(test, name)]
+    last_name = methods[-1][0]
+
+    def timed(method, name, phase):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings[phase] += time() - start
+                if name == last_name:
+                    result.add_timing(test, dict(timings))
+        return wrapper
+
+    for name, phase in methods:
+        setattr(test, name, timed(getattr(test, name), name, phase))
+
+
+class TimedTestSuite(unittest.TestSuite):
+
+    """Test suite that times the tests and the class fixtures"""
+
+    def run(self, result, debug=False):
+        if hasattr(result, 'add_timing'):
+            for test in self:
+                if not isinstance(test, unittest.TestSuite):
+                    time_test(test, result)
+        return super(TimedTestSuite, self).run(result, debug)
+
+    def _handleClassSetUp(self, test, result):  # noqa: N802
+        if test.__class__ == getattr(result, '_previousTestClass', None):
+            return
+        start = time()
+        super(TimedTestSuite, self)._handleClassSetUp(test, result)
+        if hasattr(result, 'add_class_timing'):
+            result.add_class_timing(test.__class__, 'setUpClass', time() - start)
+
+    def _tearDownPreviousClass(self, test, result):  # noqa: N802
+        previous_class = getattr(result, '_previousTestClass', None)
+        if previous_class is None or test.__class__ == previous_class:
+            return
+        start = time()
+        super(TimedTestSuite, self)._tearDownPreviousClass(test, result)
+        if hasattr(result, 'add_class_timing'):
+            result.add_class_timing(previous_class, 'tearDownClass', time() - start)
+
+
+class TimedTestLoader(unittest.TestLoader):
+    suiteClass = TimedTestSuite  # noqa: N815
+
+
+class TimeBudgetMixin(object):
+
+    """Fail tests that take longer than their time budget
+
+    The budget is checked instead of adding the success of the test, so the
+    failure is the only outcome of the test. Django's _post_teardown (rolling
+    back the test's transaction) runs after that and doesn't count.
+
+    """
+
+    # The default budget, see TimingTestRunner
+    time_budget = None
+
+    def start_timing(self, test, timings):
+        if not hasattr(self, 'running_timings'):
+            self.running_timings = {}
+        self.running_timings[test.id()] = timings
+
+    def addSuccess(self, test):  # noqa: N802
+        timings = getattr(self, 'running_timings', {}).get(test.id())
+        if timings is None or not self.check_time_budget(test, sum(timings.values())):
+            super(TimeBudgetMixin, self).addSuccess(test)
+
+    def stopTest(self, test):  # noqa: N802
+        getattr(self, 'running_timings', {}).pop(test.id(), None)
+        super(TimeBudgetMixin, self).stopTest(test)
+
+    def check_time_budget(self, test, total):
+        time_budget = getattr(test, 'time_budget', self.time_budget)
+        if time_budget is not None and total > time_budget:
+            try:
+                raise AssertionError('Test took {total:.2f}s, the time budget is {budget:.2f}s'.format(
+                    total=total, budget=time_budget
+                ))
+            except AssertionError:
+                self.addFailure(test, sys.exc_info())
+            return True
+        return False
+
+
+class TimingRemoteTestResult(TimeBudgetMixin, RemoteTestResult):
+
+    """Pass the timings of tests running in parallel to the main process
+
+    The time budget is checked in the worker, as the test succeeds.
+
+    """
+
+    def add_timing(self, test, timings):
+        self.events.append(('add_timing', self.test_index, timings))
+
+    def add_class_timing(self, cls, fixture, seconds):
+        # Each parallel subsuite holds the tests of one class, any test of the
+        # subsuite can be used to find the class in the main process
+        self.events.append(('add_class_timing', max(self.test_index, 0), fixture, seconds))
+
+
+class TimingRemoteTestRunner(RemoteTestRunner):
+    resultclass = TimingRemoteTestResult
+
+
+class TimingParallelTestSuite(ParallelTestSuite):
+    runner_class = TimingRemoteTestRunner
+
+
+class TimingResultMixin(TimeBudgetMixin):
+
+    """Collect the timings of tests and classes, and fail tests that take too long
+
+    :param time_budget: the maximum number of seconds a test may take, tests
+        can override it with a time_budget attribute. None disables the budget.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.time_budget = kwargs.pop('time_budget', None)
+        super(TimingResultMixin, self).__init__(*args, **kwargs)
+        self.test_timings = {}
+        self.class_timings = defaultdict(dict)
+
+    def add_timing(self, test, timings):
+        total = sum(timings.values())
+        self.test_timings[test.id()] = dict(timings, total=total, cls=get_label(test.__class__))
+
+    def add_class_timing(self, test, fixture, seconds):
+        # The parallel runner gives a test of the class
+        cls = test if isinstance(test, type) else test.__class__
+        self.class_timings[get_label(cls)][fixture] = seconds
+
+    def get_report(self):
+        """Return the timings of the tests and classes, slowest first"""
+
+        tests = []
+        classes = defaultdict(lambda: {'setUpClass': 0, 'tests': 0, 'tearDownClass': 0})
+        for test_id, timings in self.test_timings.items():
+            timings = dict(timings)
+            label = timings.pop('cls')
+            tests.append({'id': test_id, 'class': label, 'timings': timings})
+            classes[label]['tests'] += timings['total']
+        for label, timings in self.class_timings.items():
+            classes[label].update(timings)
+
+        classes = [
+            {'class': label, 'timings': dict(timings, total=sum(timings.values()))}
+            for label, timings in classes.items()
+        ]
+        tests.sort(key=lambda test: test['timings']['total'], reverse=True)
+        classes.sort(key=lambda cls: cls['timings']['total'], reverse=True)
+        return {'tests': tests, 'classes': classes}
+
+
+class TimingTextTestResult(TimingResultMixin, unittest.TextTestResult):
+    pass
+
+
+class TimingDebugSQLTextTestResult(TimingResultMixin, DebugSQLTextTestResult):
+    pass
+
+
+def get_label(cls):
+    return '{module}.{name}'.format(module=cls.__module__, name=cls.__name__)
+
+
+class TimingTestRunner(DiscoverRunner):
+
+    """
+    Test runner that reports the slowest tests and classes.
+
+    The setup, test and teardown of every test and the setUpClass and
+    tearDownClass of every class are timed, also when running in parallel.
+    The timings are written to var/test-timings.json.
+
+    """
+
+    test_suite = TimedTestSuite
+    parallel_test_suite = TimingParallelTestSuite
+    test_loader = TimedTestLoader()
+
+    def __init__(self, slowest=10, time_budget=None, **kwargs):
+        super(TimingTestRunner, self).__init__(**kwargs)
+        self.slowest = slowest
+        self.time_budget = time_budget
+        # The parallel workers are forked later on and inherit the budget
+        TimingRemoteTestResult.time_budget = time_budget
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super(TimingTestRunner, cls).add_arguments(parser)
+        parser.add_argument(
+            '--slowest',
+            type=int,
+            default=10,
+            help='number of slowest tests and classes to show, 0 to show none'
+        )
+        parser.add_argument(
+            '--time-budget',
+            type=float,
+            help='fail tests that take longer than this number of seconds'
+        )
+
+    def get_resultclass(self):
+        resultclass = TimingDebugSQLTextTestResult if self.debug_sql else TimingTextTestResult
+        return functools.partial(resultclass, time_budget=self.time_budget)
+
+    def run_suite(self, suite, **kwargs):
+        result = super(TimingTestRunner, self).run_suite(suite, **kwargs)
+        report = result.get_report()
+        self.print_report(result.stream, report)
+        self.write_report(report)
+        return result
+
+    def print_report(self, stream, report):
+        if not self.slowest:
+            return
+
+        stream.writeln()
+        stream.writeln('Slowest tests (setup / test / teardown):')
+        for test in report['tests'][:self.slowest]:
+            stream.writeln('{total:8.2f}s  {id} ({setup:.2f}s / {test:.2f}s / {teardown:.2f}s)'.format(
+                id=test['id'], **dict({'setup': 0, 'test': 0, 'teardown': 0}, **test['timings'])
+            ))
+
+        stream.writeln()
+        stream.writeln('Slowest classes (setUpClass / tests / tearDownClass):')
+        for cls in report['classes'][:self.slowest]:
+            stream.writeln('{total:8.2f}s  {label} ({setUpClass:.2f}s / {tests:.2f}s / {tearDownClass:.2f}s)'.format(
+                label=cls['class'], **cls['timings']
+            ))
+        stream.writeln()
+
+    def write_report(self, report):
+        report_dir = os.path.join(settings.BASE_DIR, 'var')
+        os.makedirs(report_dir, exist_ok=True)
+        with open(os.path.join(report_dir, 'test-timings.json'), 'w') as report_file:
+            json.dump(report, report_file, indent=2)
@@ -0,0 +1,113 @@
+import warnings
+
+from io import BytesIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+class Snapshot(object):
+
+    """
+    The contents of all tables of a PostgreSQL database.
+
+    Restoring a snapshot with COPY takes milliseconds, loading the fixtures it
+    was taken from with loaddata takes seconds for larger fixtures.
+
+    """
+
+    def __init__(self, tables, sequences):
+        self.tables = tables
+        self.sequences = sequences
+
+    @classmethod
+    def take(cls, connection):
+        table_names = connection.introspection.django_table_names(only_existing=True, include_views=False)
+        tables = {}
+        sequences = []
+        with connection.cursor() as cursor:
+            for table_name in table_names:
+                data = BytesIO()
+                cursor.copy_expert('COPY {table} TO STDOUT'.format(table=connection.ops.quote_name(table_name)), data)
+                tables[table_name] = data.getvalue()
+
+            for sequence in connection.introspection.sequence_list():
+                cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [sequence['table'], sequence['column']])
+                sequence_name = cursor.fetchone()[0]
+                if sequence_name:
+                    cursor.execute('SELECT last_value, is_called FROM {sequence}'.format(sequence=sequence_name))
+                    sequences.append((sequence_name,) + cursor.fetchone())
+        return cls(tables, sequences)
+
+    def restore(self, connection):
+        """Replace the contents of the tables with the snapshot
+
+        Note: Requires a superuser to disable triggers (including foreign key
+        checks) while restoring.
+
+        """
+        quote_name = connection.ops.quote_name
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute('TRUNCATE {tables} RESTART IDENTITY CASCADE'.format(
+                tables=', '.join(quote_name(table_name) for table_name in self.tables)
+            ))
+            cursor.execute('SET LOCAL session_replication_role = replica')
+            for table_name, data in self.tables.items():
+                if data:
+                    cursor.copy_expert('COPY {table} FROM STDIN'.format(table=quote_name(table_name)), BytesIO(data))
+            for sequence_name, last_value, is_called in self.sequences:
+                cursor.execute('SELECT setval(%s, %s, %s)', [sequence_name, last_value, is_called])
+
+
+def is_superuser(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT current_setting('is_superuser')")
+        return cursor.fetchone()[0] == 'on'
+
+
+# Snapshots of the current process, by database name and fixtures
+_snapshots = {}
+
+# Whether snapshots can be restored, by database name
+_can_restore = {}
+
+
+class FixtureSnapshotMixin(object):
+
+    """
+    Load the fixtures once per database, restore a snapshot for every test.
+
+    Enable with the FIXTURE_SNAPSHOTS setting. The snapshots are kept per test
+    database, so this works for parallel test runs too. Restoring requires a
+    PostgreSQL superuser, other users load the fixtures for every test (with
+    a warning).
+
+    """
+
+    def _fixture_setup(self):
+        if not getattr(settings, 'FIXTURE_SNAPSHOTS', False) or not self.fixtures:
+            return super(FixtureSnapshotMixin, self)._fixture_setup()
+
+        connection = connections[DEFAULT_DB_ALIAS]
+        name = connection.settings_dict['NAME']
+        if name not in _can_restore:
+            _can_restore[name] = is_superuser(connection)
+            if not _can_restore[name]:
+                warnings.warn(
+                    'FIXTURE_SNAPSHOTS requires a PostgreSQL superuser to restore snapshots, the database user '
+                    'is not one. The fixtures are loaded for every test.',
+                    stacklevel=2,
+                )
+        if not _can_restore[name]:
+            return super(FixtureSnapshotMixin, self)._fixture_setup()
+
+        key = (name, tuple(self.fixtures))
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            # Start from the same (flushed) database every other test starts from
+            call_command('flush', verbosity=0, interactive=False, database=DEFAULT_DB_ALIAS)
+            super(FixtureSnapshotMixin, self)._fixture_setup()
+            _snapshots[key] = Snapshot.take(connection)
+        else:
+            snapshot.restore(connection)
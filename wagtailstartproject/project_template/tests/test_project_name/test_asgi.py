@@ -0,0 +1,47 @@
+import asyncio
+
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase
+
+from {{ project_name }}.asgi import ThreadPoolHandler
+
+
+class ThreadPoolHandlerTest(SimpleTestCase):
+
+    def get_scope(self, headers=()):
+        return {'type': 'http', 'method': 'GET', 'path': '/', 'headers': list(headers)}
+
+    def call(self, handler, scope):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(handler(scope, receive, send))
+        finally:
+            loop.close()
+        return messages
+
+    def test_streaming_response(self):
+        """Streaming responses are sent chunk by chunk"""
+
+        def wsgi_application(environ, start_response):
+            response = StreamingHttpResponse(iter([b'first', b'second']))
+            start_response('200 OK', list(response.items()))
+            return response
+
+        messages = self.call(ThreadPoolHandler(wsgi_application, max_workers=1), self.get_scope())
+        self.assertEqual([message.get('body') for message in messages], [None, b'first', b'second', b''])
+        self.assertEqual([message.get('more_body', False) for message in messages[1:]], [True, True, False])
+
+    def test_repeated_cookie_headers(self):
+        environ = ThreadPoolHandler.get_environ(self.get_scope([
+            (b'cookie', b'a=1'), (b'cookie', b'b=2'), (b'accept', b'text/html'), (b'accept', b'*/*'),
+        ]), b'')
+        self.assertEqual(environ['HTTP_COOKIE'], 'a=1; b=2')
+        self.assertEqual(environ['HTTP_ACCEPT'], 'text/html,*/*')
@@ -0,0 +1,74 @@
+import threading
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': '{{ project_name }}.cache.TieredCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {'MAX_ENTRIES': 2, 'LOCAL_TIMEOUT': 60},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+})
+class TieredCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = caches['default']
+        self.shared = caches['shared']
+        self.cache.clear()
+        self.cache.stats.clear()
+
+    def test_get(self):
+        """Values are read from the shared cache once, then from the process"""
+
+        self.shared.set('key', 'value')
+        self.assertEqual('value', self.cache.get('key'))
+        self.shared.delete('key')
+        self.assertEqual('value', self.cache.get('key'))
+        self.assertIsNone(self.cache.get('other'))
+        self.assertEqual({'shared_hits': 1, 'local_hits': 1, 'misses': 1}, dict(self.cache.stats))
+
+    def test_set_and_delete(self):
+        self.cache.set('key', 'value')
+        self.assertEqual('value', self.shared.get('key'))
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertIsNone(self.shared.get('key'))
+
+    def test_max_entries(self):
+        """The least recently used values are evicted from the process"""
+
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key)
+        self.shared.clear()
+        self.assertEqual({'b': 'b', 'c': 'c'}, self.cache.get_many(['a', 'b', 'c']))
+
+    def test_get_or_set(self):
+        """Concurrent requests for a missing value compute it once"""
+
+        computed = []
+
+        def compute():
+            computed.append(True)
+            return 'value'
+
+        threads = [threading.Thread(target=self.cache.get_or_set, args=('key', compute)) for __ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([True], computed)
+        self.assertEqual('value', self.cache.get('key'))
+
+    def test_get_or_set_keeps_lock_of_other_process(self):
+        """After waiting for another process in vain, its lock is left alone"""
+
+        self.shared.set('lock:key', 'other process')
+        self.cache.lock_timeout = 0.1
+        self.assertEqual('value', self.cache.get_or_set('key', 'value'))
+        self.assertEqual('other process', self.shared.get('lock:key'))
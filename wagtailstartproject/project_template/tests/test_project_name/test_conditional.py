@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+
+class ConditionalGetTest(TestCase):
+
+    def test_validators(self):
+        response = self.client.get('/')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_not_modified(self):
+        """A page in the cache of the browser isn't rendered again"""
+
+        etag = self.client.get('/')['ETag']
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertTemplateNotUsed(response, 'pages/home_page.html')
+
+    def test_skips_authenticated_users(self):
+        etag = self.client.get('/')['ETag']
+        user = get_user_model().objects.create_user('editor', 'editor@example.com', 'password')
+        self.client.force_login(user)
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
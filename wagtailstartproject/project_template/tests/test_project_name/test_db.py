@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import SimpleTestCase
+
+from {{ project_name }}.db import base
+
+
+class ConnectionPoolTest(SimpleTestCase):
+
+    alias = 'pool_test'
+
+    def setUp(self):
+        self.addCleanup(self.close_pool)
+
+    def close_pool(self):
+        pool = base._pools.pop(self.alias, None)
+        if pool is not None:
+            for pooled_connection, __ in pool.connections:
+                pooled_connection.close()
+
+    def get_wrapper(self, **settings):
+        """Return a new connection to the test database, with the given extra settings"""
+
+        settings_dict = dict(connection.settings_dict, POOL_SIZE=1, **settings)
+        wrapper = base.DatabaseWrapper(settings_dict, alias=self.alias)
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def test_checkout_and_return(self):
+        """A closed connection goes back to the pool and is reused by the next connection"""
+
+        wrapper = self.get_wrapper()
+        raw_connection = wrapper.connection
+        wrapper.close()
+        self.assertEqual(len(wrapper.pool.connections), 1)
+        self.assertFalse(raw_connection.closed)
+
+        wrapper.ensure_connection()
+        self.assertIs(wrapper.connection, raw_connection)
+        self.assertEqual(len(wrapper.pool.connections), 0)
+
+    def test_pool_size(self):
+        """Connections that don't fit in the pool are disconnected"""
+
+        first, second = self.get_wrapper(), self.get_wrapper()
+        second_connection = second.connection
+        first.close()
+        second.close()
+        self.assertEqual(len(first.pool.connections), 1)
+        self.assertTrue(second_connection.closed)
+
+    def test_health_check_eviction(self):
+        """Pooled connections that don't work anymore are replaced"""
+
+        wrapper = self.get_wrapper(CONN_HEALTH_CHECKS=True)
+        raw_connection = wrapper.connection
+        wrapper.close()
+        raw_connection.close()
+
+        wrapper.ensure_connection()
+        self.assertIsNot(wrapper.connection, raw_connection)
+        self.assertTrue(wrapper.is_usable())
+
+    def test_max_age(self):
+        """Connections older than CONN_MAX_AGE aren't pooled"""
+
+        wrapper = self.get_wrapper(CONN_MAX_AGE=60)
+        raw_connection = wrapper.connection
+        wrapper.connection_created_at -= 60
+        wrapper.close()
+        self.assertEqual(len(wrapper.pool.connections), 0)
+        self.assertTrue(raw_connection.closed)
@@ -0,0 +1,76 @@
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from ..middleware import PageStatusMiddleware, insert_before
+
+
+class InsertBeforeTest(SimpleTestCase):
+
+    def test_insert(self):
+        chunks = [b'<html><head>', b'<title>Test</title></head>', b'<body></body></html>']
+        self.assertEqual(
+            b'<html><head><title>Test</title><meta></head><body></body></html>',
+            b''.join(insert_before(chunks, b'</head>', b'<meta>'))
+        )
+
+    def test_marker_across_chunks(self):
+        chunks = [b'<html><head></he', b'a', b'd><body></body></html>']
+        self.assertEqual(
+            b'<html><head><meta></head><body></body></html>', b''.join(insert_before(chunks, b'</head>', b'<meta>'))
+        )
+
+    def test_no_marker(self):
+        chunks = [b'<html>', b'<body></body>', b'</html>', b'</he']
+        self.assertEqual(b''.join(chunks), b''.join(insert_before(chunks, b'</head>', b'<meta>')))
+
+    def test_chunks_after_marker(self):
+        """The chunks after the marker are passed through as is"""
+
+        chunks = [b'<head></head>', b'<body>', b'</body>']
+        self.assertEqual(
+            [b'<head><meta></head>', b'<body>', b'</body>'], list(insert_before(chunks, b'</head>', b'<meta>'))
+        )
+
+
+class PageStatusMiddlewareTest(SimpleTestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.consumed = []
+
+    def stream(self, *chunks):
+        for chunk in chunks:
+            self.consumed.append(chunk)
+            yield chunk
+
+    def test_response(self):
+        response = HttpResponse('<html><head></head></html>', status=404)
+        response = PageStatusMiddleware().process_response(self.request, response)
+        self.assertEqual(b'<html><head><meta name="status_code" content="404" /></head></html>', response.content)
+        self.assertEqual(str(len(response.content)), response['Content-Length'])
+
+    def test_streaming_response(self):
+        """Streaming responses are modified while they are streamed"""
+
+        response = StreamingHttpResponse(self.stream(b'<html><head></he', b'ad></html>'))
+        response['Content-Length'] = '26'
+        response = PageStatusMiddleware().process_response(self.request, response)
+        self.assertEqual([], self.consumed)
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(
+            b'<html><head><meta name="status_code" content="200" /></head></html>',
+            b''.join(response.streaming_content)
+        )
+
+    def test_streaming_response_without_head(self):
+        response = StreamingHttpResponse(self.stream(b'<html>', b'</html>'))
+        response = PageStatusMiddleware().process_response(self.request, response)
+        self.assertEqual(b'<html></html>', b''.join(response.streaming_content))
+
+    def test_not_html(self):
+        """Other responses are passed through without consuming them"""
+
+        response = StreamingHttpResponse(self.stream(b'{', b'}'), content_type='application/json')
+        self.assertIs(response, PageStatusMiddleware().process_response(self.request, response))
+        self.assertEqual([], self.consumed)
+        self.assertEqual(b'{}', b''.join(response.streaming_content))
@@ -0,0 +1,34 @@
+from django.test import TestCase
+
+from {{ project_name }}.pages.models import ContentPage, HomePage
+from {{ project_name }}.pages.navigation import build_navigation_tree
+
+
+class NavigationTest(TestCase):
+
+    def setUp(self):
+        self.home = HomePage.objects.get()
+        self.about = self.home.add_child(instance=ContentPage(title='About', slug='about', show_in_menus=True))
+        self.team = self.about.add_child(instance=ContentPage(title='Team', slug='team', show_in_menus=True))
+        self.home.add_child(instance=ContentPage(title='Hidden', slug='hidden'))
+        self.home.add_child(instance=ContentPage(title='Draft', slug='draft', show_in_menus=True, live=False))
+
+    def test_tree(self):
+        """The live pages shown in menus are loaded in one query"""
+
+        with self.assertNumQueries(1):
+            items = build_navigation_tree(self.home, 2)
+        self.assertEqual([item.title for item in items], ['About'])
+        self.assertEqual(items[0].url, '/about/')
+        self.assertEqual([item.url for item in items[0].children], ['/about/team/'])
+
+    def test_depth(self):
+        items = build_navigation_tree(self.home, 1)
+        self.assertEqual(items[0].children, [])
+
+    def test_render(self):
+        """The navigation is rendered on every page, with the current page and its ancestors active"""
+
+        response = self.client.get('/about/team/')
+        self.assertContains(response, '<a href="/about/team/">Team</a>')
+        self.assertContains(response, 'class="active"', count=2)
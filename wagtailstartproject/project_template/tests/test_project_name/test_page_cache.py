@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+
+from {{ project_name }}.cache import bump_generation
+from {{ project_name }}.pages.models import ContentPage, HomePage
+
+from ..base import TestCase
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PAGE_CACHE_TIMEOUT=600,
+)
+class PageCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.page = HomePage.objects.get()
+        self.client.get('/')
+        HomePage.objects.filter(pk=self.page.pk).update(title='Updated')
+
+    def test_serves_cached_page(self):
+        """Anonymous visitors get the cached page until it is published"""
+
+        self.assertNotContains(self.client.get('/'), 'Updated')
+
+        self.page.refresh_from_db()
+        self.page.save_revision().publish()
+        self.run_commit_hooks()
+        self.assertContains(self.client.get('/'), 'Updated')
+
+    def test_deleted_page(self):
+        """A deleted page isn't served from the cache (deleting doesn't unpublish)"""
+
+        page = self.page.add_child(instance=ContentPage(title='About', slug='about'))
+        self.run_commit_hooks()
+        self.assertEqual(self.client.get('/about/').status_code, 200)
+
+        page.delete()
+        self.run_commit_hooks()
+        self.assertEqual(self.client.get('/about/').status_code, 404)
+
+    def test_invalidated_with_page_tree(self):
+        """All cached pages are invalidated when another page is (un)published or moved"""
+
+        bump_generation('pages')
+        self.assertContains(self.client.get('/'), 'Updated')
+
+    def test_varies_on_response_vary_headers(self):
+        """Request headers that don't change the page (e.g. Accept-Language) don't create variants"""
+
+        self.assertNotContains(self.client.get('/', HTTP_ACCEPT_LANGUAGE='xx'), 'Updated')
+
+    def test_skips_authenticated_users(self):
+        """Authenticated users always get a freshly rendered page"""
+
+        user = get_user_model().objects.create_user('editor', 'editor@example.com', 'password')
+        self.client.force_login(user)
+        self.assertContains(self.client.get('/'), 'Updated')
+
+    def test_not_modified(self):
+        """A cached page that is still in the cache of the browser isn't sent again"""
+
+        etag = self.client.get('/')['ETag']
+        self.assertEqual(self.client.get('/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase
+
+from ..base import TestCase
+from ..queries import Query, RecordedRequest, check_request, get_query_shape
+
+
+class QueryBudgetTest(TestCase):
+
+    def test_within_budget(self):
+        with self.assert_max_queries(50):
+            self.client.get('/')
+
+    def test_over_budget(self):
+        with self.assertRaisesRegex(AssertionError, 'GET / did \\d+ queries, the budget is 0'):
+            with self.assert_max_queries(0):
+                self.client.get('/')
+
+    def test_repeated_queries(self):
+        """Requests repeating a query more than max_repeats times fail, with the repeated SQL"""
+
+        with self.assertRaisesRegex(AssertionError, 'GET / repeated a query \\d+ times \\(N\\+1\\?\\):\n    SELECT'):
+            with self.assert_max_queries(max_repeats=0):
+                self.client.get('/')
+
+
+class RepeatedQueriesTest(SimpleTestCase):
+
+    def test_query_shape(self):
+        """Placeholder lists of any length have the same shape"""
+
+        self.assertEqual(
+            get_query_shape('SELECT "id" FROM "page" WHERE "id" IN (%s, %s) LIMIT 21'),
+            get_query_shape('SELECT "id" FROM "page" WHERE "id" IN (%s, %s, %s) LIMIT 21'),
+        )
+
+    def test_repeated_query(self):
+        queries = [
+            Query('SELECT "title" FROM "page" WHERE "id" = %s', 'menu.html:3', 'pages/models.py:12 in get_menu')
+            for __ in range(6)
+        ]
+        problems = check_request(RecordedRequest('GET', '/', queries), max_queries=None, max_repeats=5)
+        self.assertEqual(1, len(problems))
+        self.assertIn('repeated a query 6 times', problems[0])
+        self.assertIn('menu.html:3, pages/models.py:12 in get_menu', problems[0])
+
+    def test_repeats_within_limit(self):
+        queries = [Query('SELECT "title" FROM "page" WHERE "id" = %s', None, None)] * 5
+        self.assertEqual([], check_request(RecordedRequest('GET', '/', queries), max_queries=None, max_repeats=5))
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from wagtail.wagtailcore.models import Site
+from wagtail.wagtailredirects.models import Redirect
+
+from {{ project_name }}.redirects.table import redirect_table
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RedirectTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_redirect(self):
+        """Redirects are found in memory, and updated when they are saved"""
+
+        redirect = Redirect.objects.create(old_path='/old', redirect_link='http://example.com/new')
+        response = self.client.get('/old/?utm_source=test')
+        self.assertRedirects(response, 'http://example.com/new', status_code=301, fetch_redirect_response=False)
+
+        redirect.is_permanent = False
+        redirect.save()
+        response = self.client.get('/old/')
+        self.assertRedirects(response, 'http://example.com/new', status_code=302, fetch_redirect_response=False)
+
+    def test_not_found_without_queries(self):
+        """Once the table is loaded a 404 doesn't query the redirects"""
+
+        site = Site.objects.get()
+        redirect_table.find(site, '/does-not-exist/')
+        with self.assertNumQueries(0):
+            self.assertIsNone(redirect_table.find(site, '/does-not-exist/'))
+            self.assertIsNone(redirect_table.find(site, '/does-not-exist-either/'))
+
+    def test_without_site(self):
+        """Without a site only the redirects for all sites apply"""
+
+        site = Site.objects.get()
+        Redirect.objects.create(old_path='/all', redirect_link='http://example.com/all')
+        Redirect.objects.create(old_path='/site', site=site, redirect_link='http://example.com/site')
+        self.assertEqual(redirect_table.find(None, '/all/'), ('http://example.com/all', True))
+        self.assertIsNone(redirect_table.find(None, '/site/'))
+
+
+class DummyCacheRedirectTest(TestCase):
+
+    def test_changes_without_cache(self):
+        """Without a cache to track changes the table is rebuilt for every lookup"""
+
+        site = Site.objects.get()
+        redirect_table.find(site, '/old/')
+        redirect = Redirect.objects.create(old_path='/old', redirect_link='http://example.com/new')
+        self.assertEqual(redirect_table.find(site, '/old/'), ('http://example.com/new', True))
+
+        redirect.delete()
+        self.assertIsNone(redirect_table.find(site, '/old/'))
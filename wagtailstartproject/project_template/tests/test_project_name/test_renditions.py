@@ -0,0 +1,80 @@
+import shutil
+import tempfile
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from wagtail.wagtailimages import get_image_model
+from wagtail.wagtailimages.tests.utils import get_test_image_file
+
+from {{ project_name }}.management.commands.generate_renditions import Command, get_filter_specs
+
+
+class FilterSpecsTest(SimpleTestCase):
+
+    def test_get_filter_specs(self):
+        """The filter specs of the image tags, without attributes and the variable name"""
+
+        template_string = '\n'.join([
+            '{% templatetag openblock %} load wagtailimages_tags {% templatetag closeblock %}',
+            '{% templatetag openblock %} image page.photo fill-80x80 {% templatetag closeblock %}',
+            '{% templatetag openblock %} image page.photo width-400 class="photo" {% templatetag closeblock %}',
+            '{% templatetag openblock %} image page.photo fill-80x80 format-jpeg as photo {% templatetag closeblock %}',
+            '{% templatetag openvariable %} page.title {% templatetag closevariable %}',
+        ])
+        self.assertEqual({'fill-80x80', 'width-400', 'fill-80x80|format-jpeg'}, get_filter_specs(template_string))
+
+    @override_settings(IMAGE_RENDITION_FILTER_SPECS=['width-123'])
+    def test_setting(self):
+        """The specs of the setting are generated too"""
+
+        self.assertIn('width-123', Command().collect_filter_specs())
+
+
+class GenerateRenditionsTest(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.image = get_image_model().objects.create(title='Test', file=get_test_image_file())
+
+    @override_settings(IMAGE_RENDITION_FILTER_SPECS=['width-123'])
+    def test_spec_option(self):
+        """--spec replaces the specs of the templates and settings, invalid specs are skipped"""
+
+        stdout = StringIO()
+        call_command(
+            'generate_renditions', '--spec', 'fill-10x10', '--spec', 'wrong-10', '--dry-run',
+            stdout=stdout, stderr=StringIO()
+        )
+        self.assertIn('Filter specs: fill-10x10\n1 missing renditions of 1 images\n', stdout.getvalue())
+
+    def test_existing_renditions(self):
+        """Only the renditions that don't exist are generated"""
+
+        self.image.get_rendition('fill-10x10')
+        self.assertEqual(
+            [(self.image.pk, ['width-20'])], Command().get_missing_renditions(['fill-10x10', 'width-20'])
+        )
+
+    def test_focal_point(self):
+        """A rendition of another focal point doesn't count for filters using the focal point"""
+
+        self.image.get_rendition('fill-10x10')
+        self.image.get_rendition('width-20')
+        self.assertEqual([], Command().get_missing_renditions(['fill-10x10', 'width-20']))
+
+        self.image.focal_point_x = 10
+        self.image.focal_point_y = 10
+        self.image.focal_point_width = 20
+        self.image.focal_point_height = 20
+        self.image.save()
+        self.assertEqual(
+            [(self.image.pk, ['fill-10x10'])], Command().get_missing_renditions(['fill-10x10', 'width-20'])
+        )
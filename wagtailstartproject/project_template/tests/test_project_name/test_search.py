@@ -0,0 +1,72 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from {{ project_name }}.pages.models import ContentPage, HomePage
+from {{ project_name }}.search import hits
+from {{ project_name }}.search.paginator import SearchPaginator
+
+
+class SearchPaginatorTest(SimpleTestCase):
+
+    def setUp(self):
+        self.paginator = SearchPaginator(list(range(25)), per_page=10, max_pages=2)
+
+    def test_page(self):
+        page = self.paginator.page('1')
+        self.assertEqual(list(range(10)), list(page))
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+        self.assertEqual(2, page.next_page_number())
+
+    def test_last_page(self):
+        """The next page is not reachable beyond max_pages"""
+
+        page = self.paginator.page(2)
+        self.assertEqual(list(range(10, 20)), list(page))
+        self.assertTrue(page.has_previous())
+        self.assertFalse(page.has_next())
+
+    def test_invalid_page_numbers(self):
+        self.assertEqual(1, self.paginator.page('foo').number)
+        self.assertEqual(1, self.paginator.page(-1).number)
+        self.assertEqual(2, self.paginator.page(1000).number)
+
+    def test_out_of_range(self):
+        """Pages without results fall back to the first page"""
+
+        paginator = SearchPaginator(list(range(5)), per_page=10, max_pages=10)
+        page = paginator.page(3)
+        self.assertEqual(1, page.number)
+        self.assertEqual(list(range(5)), list(page))
+        self.assertFalse(page.has_next())
+
+
+class SearchHitsTest(SimpleTestCase):
+
+    @override_settings(SEARCH_HITS_FLUSH_INTERVAL=3600)
+    def test_first_hit_is_kept(self):
+        """Starting the flusher in a new process doesn't drop the hit being recorded"""
+
+        hits._flusher_pid = None
+        self.addCleanup(hits._hits.clear)
+        hits.record_hit('wagtail')
+        self.assertEqual(sum(count for (query_string, __), count in hits._hits.items() if query_string == 'wagtail'), 1)
+
+
+class PostgresSearchBackendTest(TestCase):
+
+    def setUp(self):
+        home = HomePage.objects.get()
+        self.pie = home.add_child(instance=ContentPage(title='Apple pie', slug='apple-pie'))
+        self.cake = home.add_child(instance=ContentPage(title='Apple cake', slug='apple-cake'))
+
+    def test_all_words(self):
+        self.assertEqual([self.pie.pk], [page.pk for page in ContentPage.objects.search('apple pie')])
+
+    def test_or_operator(self):
+        results = ContentPage.objects.search('pie cake', operator='or')
+        self.assertEqual({self.pie.pk, self.cake.pk}, {page.pk for page in results})
+
+    def test_fields(self):
+        """Searching specific fields is done by the database backend"""
+
+        self.assertEqual([self.cake.pk], [page.pk for page in ContentPage.objects.search('cake', fields=['title'])])
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from django.utils.timezone import utc
+
+from {{ project_name }}.pages.models import HomePage
+
+from ..base import TestCase
+
+
+class SitemapTest(TestCase):
+
+    def test_index(self):
+        """The index links to a sitemap per page type"""
+
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response['Content-Type'], 'application/xml; charset=utf-8')
+        self.assertContains(response, '/sitemap-pages.homepage-1.xml</loc>')
+
+    def test_sitemap(self):
+        """The sitemap lists the live pages of the page type"""
+
+        page = HomePage.objects.get()
+        response = self.client.get('/sitemap-pages.homepage-1.xml')
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertIn('<loc>{url}</loc>'.format(url=page.full_url), content)
+
+    def test_lastmod(self):
+        """The last modification is the last publication, drafts don't count"""
+
+        page = HomePage.objects.get()
+        page.last_published_at = datetime(2017, 1, 1, tzinfo=utc)
+        page.save()
+        page.save_revision()
+        self.run_commit_hooks()
+
+        lastmod = '<lastmod>2017-01-01T00:00:00+00:00</lastmod>'
+        self.assertContains(self.client.get('/sitemap.xml'), lastmod)
+        response = self.client.get('/sitemap-pages.homepage-1.xml')
+        self.assertIn(lastmod, b''.join(response.streaming_content).decode('utf-8'))
+
+    def test_unknown_sitemap(self):
+        self.assertEqual(self.client.get('/sitemap-pages.homepage-2.xml').status_code, 404)
+        self.assertEqual(self.client.get('/sitemap-auth.user-1.xml').status_code, 404)
@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from wagtail.wagtailcore.models import Site
+
+from {{ project_name }}.sites.table import site_table
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SiteTableTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.default_site = Site.objects.get()
+        self.other_site = Site.objects.create(hostname='other.example.com', root_page=self.default_site.root_page)
+
+    def test_find(self):
+        """Sites are matched on hostname, falling back to the default site, without queries"""
+
+        site_table.find('localhost', '80')
+        with self.assertNumQueries(0):
+            self.assertEqual(site_table.find('other.example.com', '8000'), self.other_site)
+            self.assertEqual(site_table.find('unknown.example.com', '80'), self.default_site)
+
+    def test_site_changed(self):
+        """The table is rebuilt when a site is saved"""
+
+        site_table.find('localhost', '80')
+        self.other_site.hostname = 'renamed.example.com'
+        self.other_site.save()
+        self.assertEqual(site_table.find('renamed.example.com', '80'), self.other_site)
+
+
+class DummyCacheSiteTableTest(TestCase):
+
+    def test_changes_without_cache(self):
+        """Without a cache to track changes the table is rebuilt for every lookup"""
+
+        site = Site.objects.get()
+        site_table.find('localhost', '80')
+        site.hostname = 'renamed.example.com'
+        site.is_default_site = False
+        site.save()
+        self.assertEqual(site_table.find('renamed.example.com', '80'), site)
+        with self.assertRaises(Site.DoesNotExist):
+            site_table.find('localhost', '80')
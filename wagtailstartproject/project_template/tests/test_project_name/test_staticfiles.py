@@ -0,0 +1,28 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+
+class CompressedStaticFilesTest(SimpleTestCase):
+
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+
+    def test_collectstatic_compresses_files(self):
+        """collectstatic writes the gzip and Brotli versions of the original and hashed files"""
+
+        with override_settings(
+            STATIC_ROOT=self.static_root,
+            STATICFILES_STORAGE='{{ project_name }}.staticfiles.CompressedManifestStaticFilesStorage',
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            hashed_name = staticfiles_storage.stored_name('admin/css/base.css')
+
+        for name in ('admin/css/base.css', hashed_name):
+            for extension in ('.gz', '.br'):
+                self.assertTrue(os.path.exists(os.path.join(self.static_root, name + extension)), name + extension)
@@ -12,16 +12,23 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 from django.conf import settings
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
-from django.core.urlresolvers import Resolver404, resolve
 from django.test.runner import RemoteTestResult
+from django.urls import Resolver404, resolve
 
+from ..queries import QueryBudgetMixin
+from ..snapshot import FixtureSnapshotMixin
+from . import drivers
 
-class SeleniumTestCase(StaticLiveServerTestCase):
+
+class SeleniumTestCase(QueryBudgetMixin, FixtureSnapshotMixin, StaticLiveServerTestCase):
 
     """
     Tests with a Selenium webdriver to run tests in a browser.
 
-    Defaults to the Chrome browser.
+    Defaults to the Chrome browser. Browsers are shared by all test classes
+    using the same browser and options, see drivers.DriverPool. With the
+    FIXTURE_SNAPSHOTS setting the fixtures are loaded once, see snapshot.py.
+    Limit the queries of the pages with assert_max_queries, see queries.py.
 
     """
 
@@ -29,7 +36,7 @@ class SeleniumTestCase(StaticLiveServerTestCase):
 
     @classmethod
     def setUpClass(cls):
-        """Start the webrdriver and create a temp dir to store screenshots of failed tests"""
+        """Get a webdriver and create a temp dir to store screenshots of failed tests"""
 
         super(SeleniumTestCase, cls).setUpClass()
         cls.driver = cls.get_driver()
@@ -37,9 +44,11 @@ class SeleniumTestCase(StaticLiveServerTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        """Quit the browser and print screenshot dir location if it contains screenshots"""
+        """Print screenshot dir location if it contains screenshots
+
+        The browser is kept open for the next test class.
 
-        cls.driver.quit()
+        """
         try:
             rmdir(cls.screenshot_dir)
         except OSError:
@@ -74,20 +83,34 @@ class SeleniumTestCase(StaticLiveServerTestCase):
             screenshot_path = path.join(self.screenshot_dir, 'screenshot_{test_id}.png'.format(test_id=self.id()))
             self.driver.save_screenshot(screenshot_path)
 
+        self.reset_driver()
         super(SeleniumTestCase, self).tearDown()
 
+    def reset_driver(self):
+        """Remove cookies and storage, the browser is reused by the next test"""
+
+        self.driver.delete_all_cookies()
+        try:
+            self.driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+        except WebDriverException:
+            # Storage is not available on some pages, e.g. 'about:blank'
+            pass
+
     @classmethod
     def get_driver(cls):
-        """Setup a Chrome webdriver"""
+        """Get a Chrome webdriver"""
 
         options = webdriver.ChromeOptions()
         options.set_headless(headless=getattr(settings, 'HEADLESS', True))
         cls.set_driver_options(options)
-        try:
-            driver = webdriver.Chrome('./node_modules/.bin/chromedriver', chrome_options=options)
-        except WebDriverException:
-            raise unittest.SkipTest('Not able to start Chrome driver.')
-        return driver
+
+        def start_driver():
+            try:
+                return webdriver.Chrome('./node_modules/.bin/chromedriver', chrome_options=options)
+            except WebDriverException:
+                raise unittest.SkipTest('Not able to start Chrome driver.')
+
+        return drivers.pool.get('chrome', options, start_driver)
 
     @classmethod
     def set_driver_options(cls, options):
@@ -172,18 +195,22 @@ class FirefoxDriverMixin(object):
 
     @classmethod
     def get_driver(cls):
-        """Setup a Firefox webdriver"""
+        """Get a Firefox webdriver"""
 
         environ['MOZ_HEADLESS'] = "1"
         options = webdriver.firefox.options.Options()
         options.set_headless(headless=getattr(settings, 'HEADLESS', True))
         cls.set_driver_options(options)
-        try:
-            driver = webdriver.Firefox(executable_path='./node_modules/.bin/geckodriver', firefox_options=options)
-        except WebDriverException:
-            raise unittest.SkipTest('Not able to start Firefox driver.')
-        driver.set_window_size(1200, 900)
-        return driver
+
+        def start_driver():
+            try:
+                driver = webdriver.Firefox(executable_path='./node_modules/.bin/geckodriver', firefox_options=options)
+            except WebDriverException:
+                raise unittest.SkipTest('Not able to start Firefox driver.')
+            driver.set_window_size(1200, 900)
+            return driver
+
+        return drivers.pool.get('firefox', options, start_driver)
 
     @classmethod
     def set_driver_options(cls, options):
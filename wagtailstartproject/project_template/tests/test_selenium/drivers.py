@@ -0,0 +1,72 @@
+import atexit
+import json
+
+from multiprocessing.util import Finalize
+from time import time
+
+from selenium.common.exceptions import WebDriverException
+
+
+class DriverPool(object):
+
+    """
+    Webdrivers shared by the test classes of a test process.
+
+    Starting a browser is the slowest part of most Selenium tests, so a driver
+    is started once per browser and set of options, and quit when the process
+    (or the worker process of a parallel test run) exits.
+
+    """
+
+    def __init__(self):
+        self.drivers = {}
+        self.started = 0
+        self.reused = 0
+        self.startup_time = 0
+
+    def get(self, browser, options, start_driver):
+        """Get a running driver, call start_driver to start a new one if needed"""
+
+        key = (browser, json.dumps(options.to_capabilities(), sort_keys=True, default=str))
+        driver = self.drivers.get(key)
+        if driver is not None:
+            try:
+                driver.current_url
+            except WebDriverException:
+                # The browser is gone, start a new one
+                del self.drivers[key]
+            else:
+                self.reused += 1
+                return driver
+
+        start = time()
+        driver = self.drivers[key] = start_driver()
+        self.startup_time += time() - start
+        self.started += 1
+        return driver
+
+    def quit(self):
+        """Quit all drivers and report the startup time saved"""
+
+        for driver in self.drivers.values():
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        self.drivers.clear()
+
+        if self.reused:
+            print('Started {started} browser(s) in {time:.1f}s, reused them {reused} times, saving ~{saved:.1f}s'.format(
+                started=self.started,
+                time=self.startup_time,
+                reused=self.reused,
+                saved=self.reused * self.startup_time / self.started,
+            ))
+            self.reused = 0
+
+
+pool = DriverPool()
+
+# Quit the drivers at exit, also in the worker processes of parallel test runs
+atexit.register(pool.quit)
+Finalize(pool, pool.quit, exitpriority=10)
@@ -4,11 +4,15 @@ from {{ project_name }}.settings import *  # noqa
 
 logging.disable(logging.CRITICAL)
 
+# Report the slowest tests, see tests/runner.py
+TEST_RUNNER = 'tests.runner.TimingTestRunner'
+
 DEBUG = False
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # The project's backend, with connection pooling disabled (see tests/test_project_name/test_db.py)
+        'ENGINE': '{{ project_name }}.db',
         'NAME': '{{ project_name }}',
         'USER': 'postgres'
     },
@@ -19,9 +23,20 @@ MIDDLEWARE += [  # noqa: F405
     'tests.middleware.PageStatusMiddleware'
 ]
 
+# Record the queries of all requests for assert_max_queries, see tests/queries.py
+MIDDLEWARE.insert(0, 'tests.middleware.QueryRecorderMiddleware')  # noqa: F405
+
+# Number of times a request may repeat a query before assert_max_queries reports an N+1 query
+QUERY_REPEAT_LIMIT = 5
+
 # Fixture location
 FIXTURE_DIRS = ['tests/fixtures/']
 
+# Load the fixtures of Selenium tests once and restore a snapshot for every test,
+# requires the database user to be a PostgreSQL superuser (falls back to loading
+# the fixtures for every test)
+FIXTURE_SNAPSHOTS = True
+
 # Set the default cache to be a dummy cache
 CACHES = {
     'default': {
@@ -29,6 +44,9 @@ CACHES = {
     }
 }
 
+# Write search hits immediately instead of in a background thread
+SEARCH_HITS_FLUSH_INTERVAL = 0
+
 # Use dummy backend for safety and performance
 EMAIL_BACKEND = 'django.core.mail.backends.dummy.EmailBackend'
 
@@ -1,56 +1,76 @@
 #!/usr/bin/env python
 from __future__ import absolute_import, print_function, unicode_literals
 
+import io
 import os
+import shutil
+import sys
 
 from argparse import ArgumentParser
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 from keyword import iskeyword
+from time import time
 
-from django.core.management import ManagementUtility
+import django
+
+from django.conf import settings
+from django.template import Context, Engine
+from django.utils.version import get_docs_version
+
+# The files of the project template that are rendered as Django templates
+TEMPLATE_EXTENSIONS = ('py', 'ini', 'html', 'rst', 'json', 'cfg')
 
 
 def check_project_name(parser, project_name):
     """Perform checks for the given project name.
 
     Checks:
+    - a valid Python identifier.
     - not a reserved Python keyword.
     - not already in use by another Python package/module.
 
+    The module is looked up without importing it.
+
     """
+    if not project_name.isidentifier():
+        parser.error("'{project_name}' is not a valid Python identifier.".format(project_name=project_name))
+
     if iskeyword(project_name):
         parser.error("'{project_name}' can not be a reserved Python keyword.".format(project_name=project_name))
 
-    try:
-        __import__(project_name)
-    except ImportError:
-        pass
-    else:
+    if find_spec(project_name) is not None:
         parser.error("'{project_name}' conflicts with the name of an existing "
                      "Python module and cannot be used as a project "
                      "name. Please try another name.".format(project_name=project_name))
 
 
-def create_project(project_name):
-    """Create the project using the Django startproject command"""
-
-    print("Creating a Wagtail project called {project_name}".format(project_name=project_name))
-
+def get_template_path():
     import wagtailstartproject
     wagtailstartproject_path = os.path.dirname(wagtailstartproject.__file__)
 
-    template_path = os.path.join(wagtailstartproject_path, 'project_template')
+    return os.path.join(wagtailstartproject_path, 'project_template')
+
+
+def create_project(project_name, target_dir='.'):
+    """Create the project using the Django startproject command"""
+
+    from django.core.management import ManagementUtility
+
+    print("Creating a Wagtail project called {project_name}".format(project_name=project_name))
 
     # Call django-admin startproject
     utility_args = [
         'django-admin.py',
         'startproject',
-        '--template=' + template_path,
-        '--extension=py,ini,html,rst,json,cfg',
+        '--template=' + get_template_path(),
+        '--extension=' + ','.join(TEMPLATE_EXTENSIONS),
         project_name
     ]
 
-    # always put the project template inside the current directory:
-    utility_args.append('.')
+    # always put the project template inside the target directory (default: the current directory):
+    utility_args.append(target_dir)
 
     utility = ManagementUtility(utility_args)
     utility.execute()
@@ -58,14 +78,154 @@ def create_project(project_name):
     print("Success! {project_name} has been created".format(project_name=project_name))
 
 
+class ProjectTemplate(object):
+
+    """
+    The project template, read and compiled once to create any number of projects.
+
+    Renders the same files with the same context as django-admin startproject.
+
+    """
+
+    def __init__(self, path):
+        # Setup a stub settings environment for template rendering
+        if not settings.configured:
+            settings.configure()
+
+        engine = Engine()
+        self.files = []
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [dirname for dirname in dirs if not dirname.startswith('.') and dirname != '__pycache__']
+            for filename in files:
+                if filename.endswith(('.pyo', '.pyc', '.py.class')):
+                    continue
+                source_path = os.path.join(root, filename)
+                template = None
+                if filename.endswith(tuple('.' + extension for extension in TEMPLATE_EXTENSIONS)):
+                    with io.open(source_path, encoding='utf-8') as template_file:
+                        template = engine.from_string(template_file.read())
+                self.files.append((os.path.relpath(source_path, path), source_path, template))
+
+    def get_files(self, project_name, target_dir):
+        """Return the target path, source path, template and context data of every file of the project"""
+
+        context = {
+            'project_name': project_name,
+            'project_directory': os.path.abspath(target_dir),
+            'camel_case_project_name': ''.join(x for x in project_name.title() if x != '_'),
+            'docs_version': get_docs_version(),
+            'django_version': django.__version__,
+        }
+
+        return [
+            (os.path.join(target_dir, relative_path.replace('project_name', project_name)), source_path, template, context)
+            for relative_path, source_path, template in self.files
+        ]
+
+
+def write_file(target_path, source_path, template, context):
+    """Write a file of the project, rendered with a context of its own (a Context can't be shared between threads)"""
+
+    from django.core.management.templates import TemplateCommand
+
+    target_dir = os.path.dirname(target_path)
+    if not os.path.isdir(target_dir):
+        try:
+            os.makedirs(target_dir)
+        except OSError:
+            # Created by another thread in the meantime
+            pass
+
+    if template is not None:
+        with io.open(target_path, 'w', encoding='utf-8') as target_file:
+            target_file.write(template.render(Context(context, autoescape=False)))
+    else:
+        shutil.copyfile(source_path, target_path)
+    shutil.copymode(source_path, target_path)
+    TemplateCommand().make_writeable(target_path)
+
+
+def create_projects_fast(project_names, target_dirs, jobs):
+    """Create the projects from a template compiled once, rendering the files in parallel
+
+    Returns the time spent compiling and rendering.
+
+    """
+    timings = OrderedDict()
+
+    start = time()
+    project_template = ProjectTemplate(get_template_path())
+    timings['compile template'] = time() - start
+
+    files = []
+    for project_name, target_dir in zip(project_names, target_dirs):
+        files.extend(project_template.get_files(project_name, target_dir))
+
+    conflicts = [target_path for target_path, __, __, __ in files if os.path.exists(target_path)]
+    if conflicts:
+        sys.exit("{path} already exists, overlaying a project into an existing directory won't "
+                 "replace conflicting files".format(path=conflicts[0]))
+
+    start = time()
+    with ThreadPoolExecutor(jobs) as executor:
+        list(executor.map(lambda args: write_file(*args), files))
+    timings['render and write {count} files'.format(count=len(files))] = time() - start
+
+    for project_name in project_names:
+        print("Success! {project_name} has been created".format(project_name=project_name))
+    return timings
+
+
 def main():
     parser = ArgumentParser(description="Setup a project for a new wagtail based website inside the current directory")
-    parser.add_argument('project_name', help="name of the project to create")
+    parser.add_argument(
+        'project_names',
+        nargs='+',
+        metavar='project_name',
+        help="name of the project to create, when several names are given each project is created in "
+             "a directory with its name"
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help="compile the project template once and render the files in parallel, "
+             "instead of running django-admin startproject for every project"
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=8,
+        help="number of files to render at the same time with --fast (default: 8)"
+    )
     args = parser.parse_args()
 
-    check_project_name(parser, args.project_name)
+    timings = OrderedDict()
+    total_start = start = time()
+    for project_name in args.project_names:
+        check_project_name(parser, project_name)
+    if len(set(args.project_names)) != len(args.project_names):
+        parser.error("Every project name can only be given once.")
+    timings['check names'] = time() - start
+
+    if len(args.project_names) == 1:
+        target_dirs = ['.']
+    else:
+        target_dirs = args.project_names
 
-    create_project(args.project_name)
+    if args.fast:
+        timings.update(create_projects_fast(args.project_names, target_dirs, args.jobs))
+    else:
+        for project_name, target_dir in zip(args.project_names, target_dirs):
+            start = time()
+            if not os.path.isdir(target_dir):
+                os.mkdir(target_dir)
+            create_project(project_name, target_dir)
+            timings['create {project_name}'.format(project_name=project_name)] = time() - start
+    timings['total'] = time() - total_start
+
+    print("Timings:")
+    for step, seconds in timings.items():
+        print("{seconds:8.3f}s  {step}".format(seconds=seconds, step=step))
 
 
 if __name__ == "__main__":